@@ -3,8 +3,7 @@ import uuid
 import os
 import asyncio
 from fastapi import APIRouter, HTTPException, UploadFile, File, Request, BackgroundTasks
-from fastapi.responses import StreamingResponse
-from io import BytesIO
+from fastapi.responses import Response
 import cv2
 from arq.jobs import Job
 from pydantic import BaseModel
@@ -124,7 +123,7 @@ async def preview_blur_frame(config: BlurPreviewConfig):
             raise HTTPException(status_code=500, detail="Failed to generate preview")
 
         _, encoded_img = cv2.imencode('.jpg', preview_image)
-        return StreamingResponse(BytesIO(encoded_img.tobytes()), media_type="image/jpeg")
+        return Response(content=encoded_img.tobytes(), media_type="image/jpeg")
 
     except Exception as e:
         logger.error(f"Preview generation failed: {e}", exc_info=True)
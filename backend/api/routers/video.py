@@ -5,8 +5,7 @@ import cv2
 import asyncio
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException, status, Form, UploadFile, File, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse, FileResponse
-from io import BytesIO
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, ValidationError
 from core.video_io import get_video_info, get_frame_image, generate_video_preview, get_video_dar, get_video_metadata
 from api.schemas import VideoMetadata, PreviewConfig
@@ -62,9 +61,8 @@ async def upload_local_chunk(
     part_number: int = Form(...),
     file: UploadFile = File(...)
 ) -> Dict[str, Any]:
-    data = await file.read()
     offset = (part_number - 1) * settings.upload_chunk_size
-    success = await storage_manager.save_chunk(upload_id, data, offset)
+    success = await storage_manager.save_chunk(upload_id, file.file, offset)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to save chunk.")
     return {"status": "ok"}
@@ -156,9 +154,8 @@ async def get_frame(filename: str, frame_index: int):
     image = await asyncio.to_thread(get_frame_image, video_path, frame_index)
     if image is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Frame not found")
-    image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-    _, encoded_img = cv2.imencode('.jpg', image_bgr)
-    return StreamingResponse(BytesIO(encoded_img.tobytes()), media_type="image/jpeg")
+    _, encoded_img = cv2.imencode('.jpg', image)
+    return Response(content=encoded_img.tobytes(), media_type="image/jpeg")
 
 @router.post("/preview")
 async def get_preview(config: PreviewConfig):
@@ -174,7 +171,7 @@ async def get_preview(config: PreviewConfig):
     if preview_image is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Processing failed")
     _, encoded_img = cv2.imencode('.jpg', preview_image)
-    return StreamingResponse(BytesIO(encoded_img.tobytes()), media_type="image/jpeg")
+    return Response(content=encoded_img.tobytes(), media_type="image/jpeg")
 
 @router.websocket("/ws/stream/{client_id}")
 async def preview_stream_endpoint(websocket: WebSocket, client_id: str):
@@ -25,12 +25,23 @@ class ConnectionManager:
         if client_id in self.stream_connections:
             del self.stream_connections[client_id]
 
+    async def _send(self, client_id: str, payload: str | dict) -> None:
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            return
+        try:
+            if isinstance(payload, str):
+                await websocket.send_text(payload)
+            else:
+                await websocket.send_json(payload)
+        except Exception as e:
+            logger.warning(f"Failed to send message to {client_id}: {e}")
+
     async def send_json(self, client_id: str, message: dict) -> None:
-        if client_id in self.active_connections:
-            try:
-                await self.active_connections[client_id].send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send message to {client_id}: {e}")
+        await self._send(client_id, message)
+
+    async def send_text(self, client_id: str, text: str) -> None:
+        await self._send(client_id, text)
 
     async def send_bytes(self, client_id: str, data: bytes) -> None:
         if client_id in self.stream_connections:
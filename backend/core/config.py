@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     max_upload_size: int = MAX_UPLOAD_SIZE
     frame_cache_size: int = 50
     blur_cache_size: int = 30
+    opencv_threads: int = 0
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -8,4 +8,6 @@ MOTION_MSE_THRESH: float = 15.0
 
 SUBTITLE_SIMILARITY_THRESH: float = 0.6
 
+PROGRESS_INTERVAL: float = 0.5
+
 ALLOWED_VIDEO_EXTENSIONS: set[str] = {".mp4", ".mkv", ".avi", ".mov", ".webm"}
\ No newline at end of file
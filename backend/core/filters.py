@@ -2,7 +2,7 @@ from typing import Any
 import cv2
 from core.gpu_utils import has_cuda, ensure_gpu, ensure_cpu
 
-def denoise_frame(frame: Any, strength: float) -> Any:
+def denoise_frame(frame: Any, strength: float, dst: Any = None) -> Any:
     if frame is None or strength <= 0:
         return frame
     h_val = float(strength)
@@ -10,17 +10,17 @@ def denoise_frame(frame: Any, strength: float) -> Any:
     if has_cuda():
         try:
             gpu_mat = ensure_gpu(frame)
-            denoised_gpu = cv2.cuda.fastNlMeansDenoisingColored(gpu_mat, h_val, h_val, 21, 7)
+            denoised_gpu = cv2.cuda.fastNlMeansDenoisingColored(gpu_mat, h_val, h_val, search_window=21, block_size=7)
             if isinstance(frame, cv2.cuda_GpuMat):
                 return denoised_gpu
-            return denoised_gpu.download()
+            return denoised_gpu.download(dst)
         except cv2.error:
             pass
 
     cpu_frame = ensure_cpu(frame)
-    return cv2.fastNlMeansDenoisingColored(cpu_frame, None, h_val, h_val, 7, 21)
+    return cv2.fastNlMeansDenoisingColored(cpu_frame, dst, h_val, h_val, 7, 21)
 
-def apply_scaling(frame: Any, scale_factor: float) -> Any:
+def apply_scaling(frame: Any, scale_factor: float, dst: Any = None) -> Any:
     if frame is None:
         return None
     if scale_factor == 1.0:
@@ -34,9 +34,9 @@ def apply_scaling(frame: Any, scale_factor: float) -> Any:
             resized_gpu = cv2.cuda.resize(gpu_mat, new_size, interpolation=cv2.INTER_CUBIC)
             if isinstance(frame, cv2.cuda_GpuMat):
                 return resized_gpu
-            return resized_gpu.download()
+            return resized_gpu.download(dst)
         except cv2.error:
             pass
 
     cpu_frame = ensure_cpu(frame)
-    return cv2.resize(cpu_frame, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
\ No newline at end of file
+    return cv2.resize(cpu_frame, None, dst=dst, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
\ No newline at end of file
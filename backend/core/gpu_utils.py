@@ -1,14 +1,17 @@
+import functools
 import cv2
 import numpy as np
 
+@functools.lru_cache(maxsize=1)
 def has_cuda() -> bool:
+    """Device count is fixed for the process lifetime, so query the driver once."""
     try:
         return cv2.cuda.getCudaEnabledDeviceCount() > 0
     except AttributeError:
         return False
 
 def ensure_gpu(frame):
-    if not has_cuda() or frame is None:
+    if not has_cuda() or frame is None or isinstance(frame, cv2.cuda_GpuMat):
         return frame
     try:
         gpu_mat = cv2.cuda_GpuMat()
@@ -25,4 +28,30 @@ def ensure_cpu(frame):
             return frame.download()
         return frame
     except cv2.error:
-        return frame
\ No newline at end of file
+        return frame
+
+class PinnedBuffer:
+    """Reusable page-locked host buffer for CUDA uploads and downloads."""
+    def __init__(self) -> None:
+        self._array: np.ndarray | None = None
+        self._registered = False
+
+    def get(self, shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        if self._array is None or self._array.shape != shape or self._array.dtype != dtype:
+            self.release()
+            self._array = np.empty(shape, dtype=dtype)
+            try:
+                cv2.cuda.registerPageLocked(self._array)
+                self._registered = True
+            except (cv2.error, AttributeError):
+                self._registered = False
+        return self._array
+
+    def release(self) -> None:
+        if self._array is not None and self._registered:
+            try:
+                cv2.cuda.unregisterPageLocked(self._array)
+            except cv2.error:
+                pass
+        self._array = None
+        self._registered = False
\ No newline at end of file
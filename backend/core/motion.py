@@ -1,55 +1,83 @@
+import functools
 from typing import Any
 import cv2
-import numpy as np
-from core.gpu_utils import ensure_gpu, ensure_cpu, has_cuda
+from core.gpu_utils import ensure_cpu, has_cuda
 from core.constants import MOTION_BLUR_KSIZE, MOTION_MSE_THRESH
 
-def detect_change_absolute(img1: Any, img2: Any) -> bool:
-    """Detect visual changes between frames using Mean Squared Error."""
-    if img1 is None or img2 is None:
-        return True
+@functools.lru_cache(maxsize=1)
+def _get_cuda_box_filter() -> Any:
+    """Create the CUDA box filter once instead of per comparison; it matches the CPU cv2.boxFilter path."""
+    return cv2.cuda.createBoxFilter(cv2.CV_8UC1, cv2.CV_8UC1, MOTION_BLUR_KSIZE)
+
+@functools.lru_cache(maxsize=1)
+def _get_cuda_stream() -> Any:
+    """Dedicated stream so motion kernels do not serialize on the default stream."""
+    return cv2.cuda.Stream()
+
+def _get_size(img: Any) -> tuple[int, int] | None:
     try:
-        size1 = img1.shape[1], img1.shape[0]
-        size2 = img2.shape[1], img2.shape[0]
+        return img.shape[1], img.shape[0]
     except AttributeError:
         try:
-            size1 = img1.size()
-            size2 = img2.size()
+            return tuple(img.size())
         except Exception:
-            return True
-    if size1 != size2:
-        return True
+            return None
+
+def compute_motion_signature(img: Any) -> Any:
+    """Reduce a BGR frame to the blurred grayscale signature used for motion checks.
+
+    Both paths smooth with the same box kernel so Smart Skip makes the same decisions with or without a GPU.
+    On CUDA builds the signature stays on the device so it can be compared against the next frame without a re-upload.
+    """
+    if img is None:
+        return None
 
     if has_cuda():
         try:
-            gpu_1 = ensure_gpu(img1)
-            gpu_2 = ensure_gpu(img2)
-            g1 = cv2.cuda.cvtColor(gpu_1, cv2.COLOR_BGR2GRAY)
-            g2 = cv2.cuda.cvtColor(gpu_2, cv2.COLOR_BGR2GRAY)
-            filter_gauss = cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, MOTION_BLUR_KSIZE, 0)
-            b1 = filter_gauss.apply(g1)
-            b2 = filter_gauss.apply(g2)
-            
-            diff = cv2.cuda.absdiff(b1, b2)
-            diff_f = cv2.cuda_GpuMat()
-            diff.convertTo(cv2.CV_32FC1, diff_f)
-            sq_diff = cv2.cuda.multiply(diff_f, diff_f)
-            sum_sq = cv2.cuda.calcSum(sq_diff)[0]
-            pixels = size1[0] * size1[1]
+            stream = _get_cuda_stream()
+            gpu_img = img
+            if not isinstance(img, cv2.cuda_GpuMat):
+                gpu_img = cv2.cuda_GpuMat()
+                gpu_img.upload(img, stream=stream)
+            gray = cv2.cuda.cvtColor(gpu_img, cv2.COLOR_BGR2GRAY, stream=stream)
+            return _get_cuda_box_filter().apply(gray, stream=stream)
+        except cv2.error:
+            pass
+
+    gray = cv2.cvtColor(ensure_cpu(img), cv2.COLOR_BGR2GRAY)
+    return cv2.boxFilter(gray, -1, MOTION_BLUR_KSIZE)
+
+def detect_change_signature(sig1: Any, sig2: Any) -> bool:
+    """Detect visual changes between two motion signatures using Mean Squared Error."""
+    if sig1 is None or sig2 is None:
+        return True
+    size1 = _get_size(sig1)
+    if size1 is None or size1 != _get_size(sig2):
+        return True
+    pixels = size1[0] * size1[1]
+
+    if has_cuda() and isinstance(sig1, cv2.cuda_GpuMat) and isinstance(sig2, cv2.cuda_GpuMat):
+        try:
+            stream = _get_cuda_stream()
+            diff = cv2.cuda.absdiff(sig1, sig2, stream=stream)
+            sum_gpu = cv2.cuda.calcSqrSum(diff, stream=stream)
+            sum_host = sum_gpu.download(stream=stream)
+            stream.waitForCompletion()
+            sum_sq = float(sum_host.ravel()[0])
             mse = sum_sq / pixels if pixels > 0 else 0
             return mse > MOTION_MSE_THRESH
         except cv2.error:
             pass
 
-    c1 = ensure_cpu(img1)
-    c2 = ensure_cpu(img2)
-    g1 = cv2.cvtColor(c1, cv2.COLOR_BGR2GRAY)
-    g2 = cv2.cvtColor(c2, cv2.COLOR_BGR2GRAY)
-    b1 = cv2.GaussianBlur(g1, MOTION_BLUR_KSIZE, 0)
-    b2 = cv2.GaussianBlur(g2, MOTION_BLUR_KSIZE, 0)
-    
-    diff = cv2.absdiff(b1, b2)
-    diff_f = diff.astype(np.float32)
-    sq_diff = diff_f ** 2
-    mse = np.mean(sq_diff)
-    return mse > MOTION_MSE_THRESH
\ No newline at end of file
+    sum_sq = cv2.norm(ensure_cpu(sig1), ensure_cpu(sig2), cv2.NORM_L2SQR)
+    mse = sum_sq / pixels if pixels > 0 else 0
+    return mse > MOTION_MSE_THRESH
+
+def detect_change_absolute(img1: Any, img2: Any) -> bool:
+    """Detect visual changes between frames using Mean Squared Error."""
+    if img1 is None or img2 is None:
+        return True
+    size1 = _get_size(img1)
+    if size1 is None or size1 != _get_size(img2):
+        return True
+    return detect_change_signature(compute_motion_signature(img1), compute_motion_signature(img2))
\ No newline at end of file
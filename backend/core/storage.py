@@ -1,60 +1,114 @@
 import os
+import errno
 import shutil
 import logging
 import asyncio
-from typing import Dict
+from typing import BinaryIO
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+_LOCK_STRIPES = 32
+
+def _link_or_copy(src: str, dest: str) -> None:
+    """Publish src at dest via a hard link when both share a filesystem, copying otherwise."""
+    if os.path.exists(dest) and os.path.samefile(src, dest):
+        return
+    tmp_dest = f"{dest}.part"
+    try:
+        os.link(src, tmp_dest)
+    except FileExistsError:
+        os.remove(tmp_dest)
+        os.link(src, tmp_dest)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EMLINK):
+            raise
+        shutil.copy2(src, tmp_dest)
+    os.replace(tmp_dest, dest)
 
 class StorageManager:
     """Storage manager with concurrent chunk upload protection."""
     def __init__(self, upload_dir: str = "uploads", temp_dir: str = ".temp") -> None:
         self.upload_dir = upload_dir
         self.temp_dir = temp_dir
-        self._locks: Dict[str, asyncio.Lock] = {}
+        self._conditions = [asyncio.Condition() for _ in range(_LOCK_STRIPES)]
+        self._writers: dict[str, int] = {}
+        self._completing: set[str] = set()
         os.makedirs(self.upload_dir, exist_ok=True)
         os.makedirs(self.temp_dir, exist_ok=True)
 
-    def _get_lock(self, filename: str) -> asyncio.Lock:
-        if filename not in self._locks:
-            self._locks[filename] = asyncio.Lock()
-        return self._locks[filename]
+    def _get_condition(self, filename: str) -> asyncio.Condition:
+        return self._conditions[hash(filename) % _LOCK_STRIPES]
+
+    async def save_chunk(self, filename: str, chunk: BinaryIO, offset: int) -> bool:
+        """Stream an uploaded chunk to its offset; positional writes let chunks of one file land concurrently.
 
-    async def save_chunk(self, filename: str, chunk_data: bytes, offset: int) -> bool:
-        """Save uploaded chunk bytes to local storage sequentially."""
+        Chunks are registered as in-flight writers under the file's lock and rejected once completion has started.
+        """
         temp_path = os.path.join(self.temp_dir, filename)
-        
-        def _write_chunk() -> None:
-            mode = "r+b" if os.path.exists(temp_path) else "w+b"
-            with open(temp_path, mode) as f:
-                f.seek(offset)
-                f.write(chunk_data)
+        final_path = os.path.join(self.upload_dir, filename)
+        condition = self._get_condition(filename)
 
-        lock = self._get_lock(filename)
-        async with lock:
+        async with condition:
+            if filename in self._completing or os.path.exists(final_path):
+                logging.error(f"Rejected chunk for {filename} at offset {offset}: upload already completed")
+                return False
             try:
-                await asyncio.to_thread(_write_chunk)
-                return True
-            except Exception as e:
-                logging.error(f"Failed to write chunk for {filename} at offset {offset}: {e}")
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT, 0o644)
+            except OSError as e:
+                logging.error(f"Failed to open temp file for {filename}: {e}")
                 return False
+            self._writers[filename] = self._writers.get(filename, 0) + 1
+
+        def _write_chunk() -> None:
+            pos = offset
+            while block := chunk.read(_COPY_BUFFER_SIZE):
+                view = memoryview(block)
+                while view:
+                    written = os.pwrite(fd, view, pos)
+                    view = view[written:]
+                    pos += written
+
+        try:
+            await asyncio.to_thread(_write_chunk)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to write chunk for {filename} at offset {offset}: {e}")
+            return False
+        finally:
+            os.close(fd)
+            async with condition:
+                remaining = self._writers.pop(filename) - 1
+                if remaining:
+                    self._writers[filename] = remaining
+                else:
+                    condition.notify_all()
 
     async def complete_local_upload(self, filename: str) -> bool:
-        """Complete upload and move file to main directory."""
+        """Wait for in-flight chunk writes, then move the file to the main directory."""
         temp_path = os.path.join(self.temp_dir, filename)
         final_path = os.path.join(self.upload_dir, filename)
-        
-        lock = self._get_lock(filename)
-        async with lock:
-            if not os.path.exists(temp_path):
-                logging.error(f"Temp file missing for completion: {filename}")
+
+        condition = self._get_condition(filename)
+        async with condition:
+            if filename in self._completing:
+                logging.error(f"Upload completion already in progress: {filename}")
                 return False
+            self._completing.add(filename)
             try:
+                await condition.wait_for(lambda: filename not in self._writers)
+                if not os.path.exists(temp_path):
+                    logging.error(f"Temp file missing for completion: {filename}")
+                    return False
                 await asyncio.to_thread(shutil.move, temp_path, final_path)
                 return True
             except Exception as e:
                 logging.error(f"Failed to finalize upload for {filename}: {e}")
                 return False
             finally:
-                self._locks.pop(filename, None)
+                self._completing.discard(filename)
+
+    async def file_exists(self, key: str) -> bool:
+        """Check whether a file is present in storage."""
+        return os.path.exists(os.path.join(self.upload_dir, key))
 
     async def download_file(self, key: str, dest: str) -> bool:
         """Copy file to destination."""
@@ -62,7 +116,7 @@ class StorageManager:
         if not os.path.exists(src):
             return False
         try:
-            await asyncio.to_thread(shutil.copy2, src, dest)
+            await asyncio.to_thread(_link_or_copy, src, dest)
             return True
         except Exception as e:
             logging.error(f"Failed to download {key} to {dest}: {e}")
@@ -72,7 +126,7 @@ class StorageManager:
         """Copy file to uploads directory."""
         dest = os.path.join(self.upload_dir, key)
         try:
-            await asyncio.to_thread(shutil.copy2, src, dest)
+            await asyncio.to_thread(_link_or_copy, src, dest)
             return True
         except Exception as e:
             logging.error(f"Failed to upload {src} to {key}: {e}")
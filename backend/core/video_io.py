@@ -1,8 +1,35 @@
 import functools
+import logging
+import os
+import threading
+from collections import OrderedDict
 import av
+from av.video.reformatter import VideoReformatter
 import cv2
 import numpy as np
-from typing import Optional, Tuple, Dict, Any, NamedTuple
+from typing import Optional, Tuple, Dict, Any, Hashable, Iterator, NamedTuple
+from core.filters import apply_scaling, denoise_frame
+from core.gpu_utils import ensure_cpu, has_cuda
+
+try:
+    from av.codec.hwaccel import HWAccel, hwdevices_available
+    HAS_HWACCEL = "cuda" in hwdevices_available()
+except ImportError:
+    HAS_HWACCEL = False
+
+logger = logging.getLogger(__name__)
+_hwaccel_failed = False
+
+def _open_input(video_path: str, use_hwaccel: bool = False) -> Any:
+    """Open a container for decoding, on NVDEC when requested and available, else in software."""
+    global _hwaccel_failed
+    if use_hwaccel and HAS_HWACCEL and not _hwaccel_failed:
+        try:
+            return av.open(video_path, hwaccel=HWAccel(device_type="cuda", allow_software_fallback=True))
+        except Exception as e:
+            _hwaccel_failed = True
+            logger.warning(f"CUDA decode unavailable, using software decoding: {e}")
+    return av.open(video_path)
 
 class VideoInfo(NamedTuple):
     """Preliminary video metadata struct."""
@@ -10,34 +37,43 @@ class VideoInfo(NamedTuple):
     total_frames: int
     corrected_width: int
 
+@functools.lru_cache(maxsize=32)
+def _probe_video(video_path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Any], Optional[float]]:
+    """Read stream metadata and display aspect ratio with a single container open."""
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        fps = float(stream.average_rate) if stream.average_rate else 25.0
+        total_frames = stream.frames
+        if total_frames <= 0:
+            total_frames = int(float(stream.duration * stream.time_base) * fps)
+        meta = {
+            "width": stream.codec_context.width,
+            "height": stream.codec_context.height,
+            "fps": fps,
+            "total_frames": total_frames
+        }
+        dar = None
+        if stream.display_aspect_ratio:
+            dar = float(stream.display_aspect_ratio)
+        elif stream.sample_aspect_ratio and stream.width and stream.height:
+            dar = (stream.width / stream.height) * float(stream.sample_aspect_ratio)
+        return meta, dar
+
+def _probe(video_path: str) -> Tuple[Dict[str, Any], Optional[float]]:
+    st = os.stat(video_path)
+    return _probe_video(video_path, st.st_mtime_ns, st.st_size)
+
 def get_video_dar(video_path: str) -> Optional[float]:
     """Calculate the Display Aspect Ratio using PyAV."""
     try:
-        with av.open(video_path) as container:
-            stream = container.streams.video[0]
-            if stream.display_aspect_ratio:
-                return float(stream.display_aspect_ratio)
-            if stream.sample_aspect_ratio and stream.width and stream.height:
-                return (stream.width / stream.height) * float(stream.sample_aspect_ratio)
-            return None
+        return _probe(video_path)[1]
     except Exception:
         return None
 
 def get_video_metadata(video_path: str) -> Dict[str, Any]:
     """Retrieve essential video metadata using PyAV."""
     try:
-        with av.open(video_path) as container:
-            stream = container.streams.video[0]
-            fps = float(stream.average_rate) if stream.average_rate else 25.0
-            total_frames = stream.frames
-            if total_frames <= 0:
-                total_frames = int(float(stream.duration * stream.time_base) * fps)
-            return {
-                "width": stream.codec_context.width,
-                "height": stream.codec_context.height,
-                "fps": fps,
-                "total_frames": total_frames
-            }
+        return dict(_probe(video_path)[0])
     except Exception as e:
         raise RuntimeError(f"Metadata extraction failed: {e}")
 
@@ -51,51 +87,188 @@ def _correct_sar(frame: np.ndarray, src_width: int, src_height: int, dar: float)
         return frame
     return cv2.resize(frame, (new_width, src_height), interpolation=cv2.INTER_CUBIC)
 
-@functools.lru_cache(maxsize=32)
+class _FrameCache:
+    """Thread-safe LRU cache of decoded frames bounded by total pixel bytes rather than entry count."""
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, Tuple[np.ndarray, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: Tuple[np.ndarray, int]) -> None:
+        nbytes = entry[0].nbytes
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[0].nbytes
+            self._entries[key] = entry
+            self._total_bytes += nbytes
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted[0].nbytes
+
+_frame_cache = _FrameCache(max_bytes=256 * 1024 * 1024)
+
 def extract_frame_cv2(video_path: str, frame_index: int, dar: Optional[float] = None) -> Optional[Tuple[np.ndarray, int]]:
-    """Extract a specific frame using sequential decoding and PTS tracking."""
+    """Extract a specific frame, serving repeated requests from the byte-bounded frame cache.
+
+    The returned frame is shared with the cache and is marked read-only; copy it before drawing on it.
+    """
     if not video_path:
         return None
+    key = (video_path, frame_index, dar)
+    cached = _frame_cache.get(key)
+    if cached is not None:
+        return cached
+    result = _decode_frame(video_path, frame_index, dar)
+    if result is not None:
+        result[0].setflags(write=False)
+        _frame_cache.put(key, result)
+    return result
+
+class _FrameReader:
+    """Open container that keeps decoding forward for nearby frame requests instead of re-seeking."""
+    max_forward_frames = 60
+
+    def __init__(self, video_path: str, file_id: Tuple[int, int]) -> None:
+        self.video_path = video_path
+        self.file_id = file_id
+        self.container = _open_input(video_path, use_hwaccel=True)
+        self.stream = self.container.streams.video[0]
+        self.fps = float(self.stream.average_rate) if self.stream.average_rate else 25.0
+        self._reformatter = VideoReformatter()
+        self._frames: Optional[Iterator[Any]] = None
+        self._next_idx: Optional[int] = None
+        self.closed = False
+
+    def _seek(self, frame_index: int) -> None:
+        target_timestamp = int((frame_index / self.fps) / self.stream.time_base)
+        self.container.seek(target_timestamp, stream=self.stream, backward=True)
+        self._frames = self.container.decode(self.stream)
+        self._next_idx = None
+
+    def read(self, frame_index: int) -> Optional[np.ndarray]:
+        """Return the BGR frame at frame_index, continuing from the last position when it lies just ahead."""
+        if self._frames is None or self._next_idx is None or not (self._next_idx <= frame_index < self._next_idx + self.max_forward_frames):
+            self._seek(frame_index)
+        for frame in self._frames:
+            if self._next_idx is None:
+                if frame.pts is not None:
+                    self._next_idx = int(round((frame.pts * float(self.stream.time_base)) * self.fps))
+                else:
+                    self._next_idx = 0
+            current_idx = self._next_idx
+            self._next_idx += 1
+            if current_idx >= frame_index:
+                return self._reformatter.reformat(frame, format='bgr24').to_ndarray()
+        self._frames = None
+        return None
+
+    def close(self) -> None:
+        self._frames = None
+        self.closed = True
+        self.container.close()
+
+MAX_OPEN_READERS = 4
+_readers: OrderedDict[str, Tuple[_FrameReader, threading.Lock]] = OrderedDict()
+_readers_lock = threading.Lock()
+
+def _get_reader(video_path: str, file_id: Tuple[int, int]) -> Tuple[_FrameReader, threading.Lock]:
+    """Return the open reader for video_path, opening it and closing the least recently used one as needed.
+
+    The container is opened outside the registry lock so a cold open never stalls previews of other videos.
+    """
+    with _readers_lock:
+        entry = _readers.get(video_path)
+        if entry is not None and entry[0].file_id == file_id:
+            _readers.move_to_end(video_path)
+            return entry
+
+    opened = (_FrameReader(video_path, file_id), threading.Lock())
+    stale: list[Tuple[_FrameReader, threading.Lock]] = []
+    with _readers_lock:
+        entry = _readers.get(video_path)
+        if entry is not None and entry[0].file_id == file_id:
+            stale.append(opened)
+            _readers.move_to_end(video_path)
+        else:
+            if entry is not None:
+                stale.append(_readers.pop(video_path))
+            entry = opened
+            _readers[video_path] = entry
+            while len(_readers) > MAX_OPEN_READERS:
+                stale.append(_readers.popitem(last=False)[1])
+    for reader, lock in stale:
+        with lock:
+            reader.close()
+    return entry
+
+def _drop_reader(video_path: str, reader: _FrameReader) -> None:
+    with _readers_lock:
+        entry = _readers.get(video_path)
+        if entry is not None and entry[0] is reader:
+            del _readers[video_path]
+    reader.close()
+
+def _read_frame(video_path: str, frame_index: int) -> Optional[np.ndarray]:
+    st = os.stat(video_path)
+    file_id = (st.st_mtime_ns, st.st_size)
+    while True:
+        reader, lock = _get_reader(video_path, file_id)
+        with lock:
+            if reader.closed:
+                continue
+            try:
+                return reader.read(frame_index)
+            except Exception:
+                _drop_reader(video_path, reader)
+                raise
+
+def _decode_frame(video_path: str, frame_index: int, dar: Optional[float]) -> Optional[Tuple[np.ndarray, int]]:
+    """Extract a specific frame using sequential decoding and PTS tracking."""
     try:
-        with av.open(video_path) as container:
-            stream = container.streams.video[0]
-            fps = float(stream.average_rate) if stream.average_rate else 25.0
-            target_timestamp = int((frame_index / fps) / stream.time_base)
-            container.seek(target_timestamp, stream=stream, backward=True)
-            
-            first = True
-            current_idx = 0
-            for frame in container.decode(stream):
-                if first:
-                    if frame.pts is not None:
-                        current_idx = int(round((frame.pts * float(stream.time_base)) * fps))
-                    else:
-                        current_idx = 0
-                    first = False
-                
-                if current_idx >= frame_index:
-                    img = frame.to_ndarray(format='bgr24')
-                    h, w = img.shape[:2]
-                    if dar is None:
-                        dar = get_video_dar(video_path)
-                    if dar is not None and abs(dar - (w / h)) > 1e-3:
-                        img = _correct_sar(img, w, h, dar)
-                        return img, int(round(h * dar))
-                    return img, w
-                current_idx += 1
+        img = _read_frame(video_path, frame_index)
+        if img is None:
+            return None
+        h, w = img.shape[:2]
+        if dar is None:
+            dar = get_video_dar(video_path)
+        if dar is not None and abs(dar - (w / h)) > 1e-3:
+            img = _correct_sar(img, w, h, dar)
+            return img, int(round(h * dar))
+        return img, w
     except Exception:
         pass
     return None
 
-def iter_frames(video_path: str, step: int = 1, fps: float = 25.0, total: int = 0, width: int = 0, height: int = 0, use_hwaccel: bool = True):
-    """Yield video frames sequentially using PyAV."""
-    with av.open(video_path) as container:
+def to_bgr(frame: Any) -> np.ndarray:
+    """Convert a lazily yielded PyAV frame to a BGR array; arrays pass through unchanged."""
+    if isinstance(frame, np.ndarray):
+        return frame
+    return frame.to_ndarray(format='bgr24')
+
+def iter_frames(video_path: str, step: int = 1, fps: float = 25.0, total: int = 0, width: int = 0, height: int = 0, use_hwaccel: bool = True, lazy: bool = False):
+    """Yield video frames sequentially using PyAV.
+
+    With lazy=True the decoded av.VideoFrame is yielded as-is so callers only pay the BGR conversion, via to_bgr, for frames they actually inspect.
+    """
+    with _open_input(video_path, use_hwaccel) as container:
         stream = container.streams.video[0]
         stream.thread_type = "AUTO"
+        reformatter = VideoReformatter()
         frame_idx = 0
         for frame in container.decode(stream):
             if frame_idx % step == 0:
-                img = frame.to_ndarray(format='bgr24')
+                img = frame if lazy else reformatter.reformat(frame, format='bgr24').to_ndarray()
                 timestamp = frame_idx / fps
                 yield frame_idx, timestamp, img
             frame_idx += 1
@@ -110,17 +283,16 @@ def get_video_info(video_path: str) -> VideoInfo:
         return VideoInfo(None, 1, 0)
     frame, corrected_width = result
     meta = get_video_metadata(video_path)
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if frame is not None else None
-    return VideoInfo(frame_rgb, meta["total_frames"], corrected_width)
+    return VideoInfo(frame, meta["total_frames"], corrected_width)
 
 def get_frame_image(video_path: str, frame_index: int) -> np.ndarray | None:
-    """Retrieve a single frame as an RGB numpy array."""
+    """Retrieve a single frame as a BGR numpy array."""
     dar = get_video_dar(video_path)
     result = extract_frame_cv2(video_path, frame_index, dar=dar)
     if result is None:
         return None
     frame, _ = result
-    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return frame
 
 def generate_video_preview(video_path: str, frame_index: int, roi_override: list[int] | None, scale_factor: float) -> np.ndarray | None:
     """Generate a processed preview image applying ROI and filters."""
@@ -151,8 +323,17 @@ def generate_video_preview(video_path: str, frame_index: int, roi_override: list
         frame_roi = frame_bgr
     if frame_roi.size == 0:
         return None
-    denoised = cv2.cuda.fastNlMeansDenoisingColored(frame_roi, None, 3.0, 3.0, 7, 21) if cv2.cuda.getCudaEnabledDeviceCount() > 0 else cv2.fastNlMeansDenoisingColored(frame_roi, None, 3.0, 3.0, 7, 21)
-    processed = denoised
-    if scale_factor > 1.0 and processed is not None:
-        processed = cv2.resize(processed, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
+    if has_cuda():
+        try:
+            gpu_roi = cv2.cuda_GpuMat()
+            gpu_roi.upload(frame_roi)
+            processed = denoise_frame(gpu_roi, strength=3.0)
+            if scale_factor > 1.0:
+                processed = apply_scaling(processed, scale_factor=scale_factor)
+            return ensure_cpu(processed)
+        except cv2.error:
+            pass
+    processed = denoise_frame(frame_roi, strength=3.0)
+    if scale_factor > 1.0:
+        processed = apply_scaling(processed, scale_factor=scale_factor)
     return processed
\ No newline at end of file
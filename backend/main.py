@@ -1,11 +1,12 @@
 import asyncio
 import json
 import logging
+import os
 import time
 import shutil
 from pathlib import Path
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import ValidationError
@@ -20,24 +21,27 @@ from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_PONG = json.dumps({"type": "pong"})
+
 async def cleanup_loop():
     """Periodic background task to clean temporary files older than 24 hours."""
     while True:
         await asyncio.sleep(86400)
         temp_root = Path(settings.cache_dir) / ".temp"
-        if not temp_root.exists():
-            continue
         now = time.time()
-        for entry in temp_root.iterdir():
-            try:
-                mtime = entry.stat().st_mtime
-                if now - mtime > 86400:
-                    if entry.is_dir():
-                        shutil.rmtree(entry, ignore_errors=True)
-                    elif entry.is_file():
-                        entry.unlink(missing_ok=True)
-            except Exception:
-                pass
+        try:
+            with os.scandir(temp_root) as entries:
+                for entry in entries:
+                    try:
+                        if now - entry.stat(follow_symlinks=False).st_mtime > 86400:
+                            if entry.is_dir(follow_symlinks=False):
+                                shutil.rmtree(entry.path, ignore_errors=True)
+                            else:
+                                os.unlink(entry.path)
+                    except OSError:
+                        pass
+        except FileNotFoundError:
+            continue
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -74,14 +78,12 @@ app.include_router(session.router, prefix="/api/session", tags=["Session"])
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
     redis_up = False
     try:
-        r = aioredis.from_url(settings.redis_url)
-        await r.ping()
+        await request.app.state.redis.ping()
         redis_up = True
-        await r.aclose()
     except Exception:
         pass
     return {"status": "ok", "redis": redis_up}
@@ -104,8 +106,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str) -> None:
                         if message["type"] == "message":
                             raw_data = message["data"]
                             data_str = raw_data.decode("utf-8") if isinstance(raw_data, bytes) else raw_data
-                            data = json.loads(data_str)
-                            await connection_manager.send_json(client_id, data)
+                            await connection_manager.send_text(client_id, data_str)
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
@@ -119,7 +120,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str) -> None:
             try:
                 message = WebSocketMessage.model_validate_json(data)
                 if message.type == "ping":
-                    await connection_manager.send_json(client_id, {"type": "pong"})
+                    await connection_manager.send_text(client_id, _PONG)
             except ValidationError:
                 pass
     except (WebSocketDisconnect, asyncio.TimeoutError):
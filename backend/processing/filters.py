@@ -2,17 +2,37 @@ from typing import Any
 import numpy as np
 import cv2
 from core.filters import apply_scaling, denoise_frame
-from core.motion import detect_change_absolute
+from core.gpu_utils import PinnedBuffer, has_cuda
+from core.motion import compute_motion_signature, detect_change_signature
 
 class ImagePipeline:
     """Pipeline for processing video frames and extracting ROIs."""
     
     def __init__(self, roi: list[int], config: dict[str, Any]) -> None:
         self.roi = roi
-        self.config = config
-        self.last_raw_roi: Any = None
+        self.update_config(config)
+        self.last_motion_sig: Any = None
         self.skipped_count = 0
         self.max_continuous_skips = 10
+        self._buffers: list[np.ndarray | None] = [None, None]
+        self._pinned_in = PinnedBuffer()
+        self._pinned_out = PinnedBuffer()
+        self._use_umat = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+        self.min_umat_pixels = 256 * 256
+
+    def update_config(self, config: dict[str, Any]) -> None:
+        """Store the config and resolve the per-frame filter parameters once."""
+        self.config = config
+        self._denoise_str = float(config.get("denoise_strength", 3))
+        self._scale_factor = float(config.get("scale_factor", 2.0))
+
+    def _buffer(self, slot: int, shape: tuple[int, ...]) -> np.ndarray:
+        """Return a reusable output buffer of the requested shape."""
+        buf = self._buffers[slot]
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._buffers[slot] = buf
+        return buf
 
     def get_roi(self, frame: np.ndarray) -> np.ndarray:
         """Extract Region of Interest from the given frame."""
@@ -25,16 +45,20 @@ class ImagePipeline:
         return frame
 
     def process(self, frame: np.ndarray) -> tuple[np.ndarray | None, bool]:
-        """Process the frame and determine if it should be skipped."""
+        """Process the frame and determine if it should be skipped.
+
+        The returned image may be a view into a reused buffer and is only valid until the next call.
+        """
         frame_roi = self.get_roi(frame)
 
         if frame_roi.size == 0:
             return None, True
 
         skipped = False
+        motion_sig = compute_motion_signature(frame_roi)
 
-        if self.last_raw_roi is not None:
-            has_changed = detect_change_absolute(frame_roi, self.last_raw_roi)
+        if self.last_motion_sig is not None:
+            has_changed = detect_change_signature(motion_sig, self.last_motion_sig)
             if not has_changed and self.skipped_count < self.max_continuous_skips:
                 self.skipped_count += 1
                 skipped = True
@@ -42,7 +66,7 @@ class ImagePipeline:
                 self.skipped_count = 0
 
         if not skipped:
-            self.last_raw_roi = frame_roi.copy()
+            self.last_motion_sig = motion_sig
 
         if skipped:
             return None, True
@@ -50,13 +74,61 @@ class ImagePipeline:
         return self.apply_filters(frame), False
 
     def apply_filters(self, frame: np.ndarray) -> np.ndarray | None:
-        """Apply configured filters to the extracted ROI."""
+        """Apply configured filters to the extracted ROI, writing into reused buffers."""
         frame_roi = self.get_roi(frame)
         if frame_roi.size == 0:
             return None
 
-        denoise_str = float(self.config.get("denoise_strength", 3))
-        scale_factor = float(self.config.get("scale_factor", 2.0))
+        denoise_str = self._denoise_str
+        scale_factor = self._scale_factor
+
+        if denoise_str <= 0 and scale_factor == 1.0:
+            return frame_roi
+
+        if has_cuda():
+            try:
+                return self._apply_filters_cuda(frame_roi, denoise_str, scale_factor)
+            except cv2.error:
+                pass
+        elif self._use_umat and frame_roi.shape[0] * frame_roi.shape[1] > self.min_umat_pixels:
+            try:
+                return self._apply_filters_umat(frame_roi, denoise_str, scale_factor)
+            except cv2.error:
+                pass
+
+        denoised = frame_roi
+        if denoise_str > 0:
+            denoised = denoise_frame(frame_roi, strength=denoise_str, dst=self._buffer(0, frame_roi.shape))
+
+        if scale_factor == 1.0:
+            return denoised
+
+        h, w = denoised.shape[:2]
+        scaled_shape = (round(h * scale_factor), round(w * scale_factor)) + denoised.shape[2:]
+        return apply_scaling(denoised, scale_factor=scale_factor, dst=self._buffer(1, scaled_shape))
+
+    def _apply_filters_cuda(self, frame_roi: np.ndarray, denoise_str: float, scale_factor: float) -> np.ndarray:
+        """Run the filter chain on the GPU with a single pinned upload and download."""
+        staging = self._pinned_in.get(frame_roi.shape)
+        np.copyto(staging, frame_roi)
+        gpu_roi = cv2.cuda_GpuMat()
+        gpu_roi.upload(staging)
+
+        processed = denoise_frame(gpu_roi, strength=denoise_str)
+        processed = apply_scaling(processed, scale_factor=scale_factor)
+        if not isinstance(processed, cv2.cuda_GpuMat):
+            return processed
+
+        width, height = processed.size()
+        return processed.download(self._pinned_out.get((height, width, frame_roi.shape[2])))
+
+    def _apply_filters_umat(self, frame_roi: np.ndarray, denoise_str: float, scale_factor: float) -> np.ndarray:
+        """Run the filter chain through OpenCV's Transparent API on an OpenCL device."""
+        processed = denoise_frame(cv2.UMat(frame_roi), strength=denoise_str)
+        processed = apply_scaling(processed, scale_factor=scale_factor)
+        return processed.get() if isinstance(processed, cv2.UMat) else processed
 
-        denoised = denoise_frame(frame_roi, strength=denoise_str)
-        return apply_scaling(denoised, scale_factor=scale_factor)
\ No newline at end of file
+    def release(self) -> None:
+        """Release page-locked staging buffers."""
+        self._pinned_in.release()
+        self._pinned_out.release()
\ No newline at end of file
@@ -3,6 +3,14 @@ import threading
 from typing import Any
 import numpy as np
 
+def _y_centers(boxes: np.ndarray) -> np.ndarray:
+    """Vertical centers of quadrilateral boxes shaped (N, points, 2)."""
+    return (boxes[:, 0, 1] + boxes[:, 2, 1]) * 0.5
+
+def _box_y_center(box: Any) -> float:
+    """Vertical center of a single box, or 0 when it is not a quadrilateral."""
+    return (box[0][1] + box[2][1]) / 2.0 if len(box) >= 3 and len(box[0]) >= 2 and len(box[2]) >= 2 else 0
+
 class PaddleWrapper:
     DET_PARAMS = {
         "det_limit_side_len": 2500,
@@ -13,7 +21,7 @@ class PaddleWrapper:
         "rec_batch_num": 8,
     }
 
-    def __init__(self, lang: str = "en", use_gpu: bool = True) -> None:
+    def __init__(self, lang: str = "en", use_gpu: bool = True, enable_hpi: bool = True, precision: str = "fp16") -> None:
         self.use_gpu = use_gpu
         self._inference_lock = threading.Lock()
         self._init_device()
@@ -24,13 +32,30 @@ class PaddleWrapper:
         except ImportError:
             raise ImportError("PaddleOCR is not installed.")
 
-        self.ocr = PaddleOCR(
-            lang=lang,
-            use_doc_orientation_classify=False,
-            use_doc_unwarping=False,
-            use_textline_orientation=False,
+        base_kwargs = {
+            "lang": lang,
+            "use_doc_orientation_classify": False,
+            "use_doc_unwarping": False,
+            "use_textline_orientation": False,
             **self.DET_PARAMS,
-        )
+        }
+        self._base_kwargs = base_kwargs
+        self._hpi_unverified = False
+        self.ocr = None
+        if use_gpu and enable_hpi:
+            try:
+                self.ocr = PaddleOCR(**base_kwargs, enable_hpi=True, precision=precision)
+                self._hpi_unverified = True
+            except Exception as e:
+                logging.warning(f"High-performance inference unavailable, using default Paddle backend: {e}")
+        if self.ocr is None:
+            self.ocr = PaddleOCR(**base_kwargs)
+
+    def _use_default_backend(self) -> None:
+        """Replace the high-performance engine with the default Paddle backend."""
+        from paddleocr import PaddleOCR
+        self.ocr = PaddleOCR(**self._base_kwargs)
+        self._hpi_unverified = False
 
     def _init_device(self) -> None:
         try:
@@ -51,76 +76,153 @@ class PaddleWrapper:
             logging.warning(f"Failed to set Paddle device, falling back to CPU: {e}")
             paddle.set_device("cpu")
 
+    def _predict_each(self, frames: list[np.ndarray], strict: bool = False) -> list[Any]:
+        results = []
+        for safe_frame in frames:
+            try:
+                if hasattr(self.ocr, 'predict'):
+                    res = self.ocr.predict(safe_frame)
+                else:
+                    res = self.ocr.ocr(safe_frame)
+                results.append(res)
+            except Exception as e:
+                if strict:
+                    raise
+                logging.error(f"OCR inference failed for frame: {e}")
+                results.append(None)
+        return results
+
+    def _infer(self, frames: list[np.ndarray], strict: bool = False) -> list[Any]:
+        if len(frames) > 1 and hasattr(self.ocr, 'predict'):
+            try:
+                batched = list(self.ocr.predict(frames))
+                if len(batched) == len(frames):
+                    return [[res] for res in batched]
+                logging.warning(f"Batched OCR returned {len(batched)} results for {len(frames)} frames, retrying per frame")
+            except Exception as e:
+                logging.warning(f"Batched OCR inference failed, retrying per frame: {e}")
+        return self._predict_each(frames, strict)
+
     def predict_batch(self, frames: list[np.ndarray]) -> list[Any]:
+        """Run OCR over the frames in one batched predict call, falling back to per-frame inference on failure.
+
+        A high-performance engine that fails before its first successful prediction is swapped for the default Paddle backend.
+        """
         if not frames:
             return []
 
-        results = []
         with self._inference_lock:
-            for frame in frames:
+            staged = [np.ascontiguousarray(frame) for frame in frames]
+            if self._hpi_unverified:
                 try:
-                    safe_frame = np.ascontiguousarray(frame)
-                    if hasattr(self.ocr, 'predict'):
-                        res = self.ocr.predict(safe_frame)
-                    else:
-                        res = self.ocr.ocr(safe_frame)
-                    results.append(res)
+                    results = self._infer(staged, strict=True)
+                    self._hpi_unverified = False
+                    return results
                 except Exception as e:
-                    logging.error(f"OCR inference failed for frame: {e}")
-                    results.append(None)
-        return results
+                    logging.warning(f"High-performance inference failed, switching to default Paddle backend: {e}")
+                    self._use_default_backend()
+            return self._infer(staged)
 
     @staticmethod
-    def parse_results(result_list: Any, conf_thresh: float) -> tuple[str, float]:
+    def _extract_lines(result_list: Any) -> tuple[list[str], np.ndarray, Any] | None:
+        """Pull stripped texts, float64 scores and raw boxes out of one frame's OCR result."""
         if not result_list:
-            return "", 0.0
+            return None
 
         res_obj = result_list[0]
         data: Any = res_obj.get("res", res_obj) if isinstance(res_obj, dict) else getattr(res_obj, "res", res_obj)
 
         if not data:
-            return "", 0.0
+            return None
 
         texts = data.get("rec_texts", []) if isinstance(data, dict) else getattr(data, "rec_texts", [])
         scores = data.get("rec_scores", []) if isinstance(data, dict) else getattr(data, "rec_scores", [])
         boxes = data.get("rec_boxes", []) if isinstance(data, dict) else getattr(data, "rec_boxes", [])
 
         if not texts:
-            return "", 0.0
+            return None
+
+        texts_list = [str(t).strip() for t in (texts.tolist() if isinstance(texts, np.ndarray) else texts)]
+        n = len(texts_list)
+
+        scores_arr = np.zeros(n, dtype=np.float64)
+        n_scores = min(n, len(scores))
+        if n_scores:
+            scores_arr[:n_scores] = np.asarray(scores[:n_scores], dtype=np.float64)
+        return texts_list, scores_arr, boxes
 
-        texts_list = texts.tolist() if isinstance(texts, np.ndarray) else texts
-        scores_list = scores.tolist() if isinstance(scores, np.ndarray) else scores
-        boxes_list = boxes.tolist() if isinstance(boxes, np.ndarray) else boxes
+    @staticmethod
+    def _order_lines(idx: np.ndarray, boxes: Any, n: int) -> np.ndarray:
+        """Reorder kept line indices top-to-bottom by box center when boxes are quadrilaterals."""
+        try:
+            boxes_arr = np.asarray(boxes, dtype=np.float32)
+        except (ValueError, TypeError):
+            boxes_arr = None
+
+        if boxes_arr is not None and boxes_arr.ndim == 3 and boxes_arr.shape[0] >= n and boxes_arr.shape[1] >= 3 and boxes_arr.shape[2] >= 2:
+            return idx[np.argsort(_y_centers(boxes_arr[idx]), kind="stable")]
+        if boxes_arr is None or boxes_arr.ndim == 3:
+            boxes_list = boxes.tolist() if isinstance(boxes, np.ndarray) else boxes
+            try:
+                return np.array(sorted(idx.tolist(), key=lambda i: _box_y_center(boxes_list[i] if i < len(boxes_list) else [])))
+            except (IndexError, TypeError):
+                pass
+        return idx
 
-        valid_items: list[tuple[Any, str, float]] = []
-        for i, raw_text in enumerate(texts_list):
-            text = str(raw_text).strip()
-            score = float(scores_list[i]) if i < len(scores_list) else 0.0
-            if score >= conf_thresh and text:
-                box = boxes_list[i] if i < len(boxes_list) else []
-                valid_items.append((box, text, score))
+    @staticmethod
+    def parse_results(result_list: Any, conf_thresh: float) -> tuple[str, float]:
+        lines = PaddleWrapper._extract_lines(result_list)
+        if lines is None:
+            return "", 0.0
+        texts_list, scores_arr, boxes = lines
+        n = len(texts_list)
 
-        if not valid_items:
+        mask = (scores_arr >= conf_thresh) & np.fromiter((bool(t) for t in texts_list), dtype=bool, count=n)
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
             return "", 0.0
 
-        try:
-            valid_items.sort(key=lambda x: (x[0][0][1] + x[0][2][1]) / 2.0 if len(x[0]) >= 3 and len(x[0][0]) >= 2 and len(x[0][2]) >= 2 else 0)
-        except (IndexError, TypeError):
-            pass
+        idx = PaddleWrapper._order_lines(idx, boxes, n)
+        final_text = " ".join([texts_list[i] for i in idx])
+        return final_text, float(scores_arr[idx].mean())
 
-        final_texts = [item[1] for item in valid_items]
-        final_scores = [item[2] for item in valid_items]
-        avg_conf = sum(final_scores) / len(final_scores) if final_scores else 0.0
-        return " ".join(final_texts), avg_conf
+    @staticmethod
+    def parse_results_batch(result_lists: list[Any], conf_thresh: float) -> list[tuple[str, float]]:
+        """Parse a batch of OCR results, filtering and averaging all lines in single vectorized passes."""
+        extracted = [PaddleWrapper._extract_lines(r) for r in result_lists]
+        parsed: list[tuple[str, float]] = [("", 0.0)] * len(result_lists)
+
+        frames = [i for i, lines in enumerate(extracted) if lines is not None]
+        if not frames:
+            return parsed
+
+        counts = np.array([len(extracted[i][0]) for i in frames], dtype=np.intp)
+        offsets = np.zeros(len(frames) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        all_texts = [t for i in frames for t in extracted[i][0]]
+        all_scores = np.concatenate([extracted[i][1] for i in frames])
+        owner = np.repeat(np.arange(len(frames)), counts)
+
+        mask = (all_scores >= conf_thresh) & np.fromiter((bool(t) for t in all_texts), dtype=bool, count=len(all_texts))
+        kept = np.bincount(owner[mask], minlength=len(frames))
+        sums = np.bincount(owner[mask], weights=all_scores[mask], minlength=len(frames))
+
+        for k in np.flatnonzero(kept).tolist():
+            texts_list, _, boxes = extracted[frames[k]]
+            start = offsets[k]
+            idx = np.flatnonzero(mask[start:offsets[k + 1]])
+            idx = PaddleWrapper._order_lines(idx, boxes, len(texts_list))
+            parsed[frames[k]] = (" ".join([texts_list[i] for i in idx]), float(sums[k] / kept[k]))
+        return parsed
 
 _engine_lock = threading.Lock()
-_engines: dict[tuple[str, bool], PaddleWrapper] = {}
+_engines: dict[tuple[str, bool, bool, str], PaddleWrapper] = {}
 
-def get_paddle_engine(lang: str = "en", use_gpu: bool = True) -> PaddleWrapper:
-    key = (lang, use_gpu)
+def get_paddle_engine(lang: str = "en", use_gpu: bool = True, enable_hpi: bool = True, precision: str = "fp16") -> PaddleWrapper:
+    key = (lang, use_gpu, enable_hpi, precision)
     if key not in _engines:
         with _engine_lock:
             if key not in _engines:
                 _engines.clear()
-                _engines[key] = PaddleWrapper(lang=lang, use_gpu=use_gpu)
+                _engines[key] = PaddleWrapper(lang=lang, use_gpu=use_gpu, enable_hpi=enable_hpi, precision=precision)
     return _engines[key]
\ No newline at end of file
@@ -1,16 +1,54 @@
 import logging
 import time
+from collections.abc import Iterator
 from typing import Any, Dict
 
+import numpy as np
+
+from core.constants import PROGRESS_INTERVAL
+from core.video_io import to_bgr
 from processing.ocr_engine import PaddleWrapper, get_paddle_engine
 from processing.aggregator import SubtitleAggregator
 from processing.filters import ImagePipeline
-from processing.video_reader import VideoProvider
+from processing.video_reader import BackgroundIterator, VideoProvider
 from processing.interfaces import OCRReporter, CancellationToken
 from processing.presets import get_preset_config
 
 logger = logging.getLogger(__name__)
 
+def _iter_groups(video: VideoProvider, pipeline: ImagePipeline, group_size: int, total_frames: int) -> Iterator[tuple[int, np.ndarray, list[np.ndarray | None] | None]]:
+    """Group decoded frames by step and run the motion check, keeping pixels only for groups that changed.
+
+    Yields (last frame index, group timestamps, filtered ROIs); the ROI list is None for skipped groups and holds None where a ROI came out empty.
+    """
+    group_ts = np.empty(group_size, dtype=np.float64)
+    group_frames: list[Any] = [None] * group_size
+    group_len = 0
+
+    for frame_idx, timestamp, frame in video:
+        group_ts[group_len] = timestamp
+        group_frames[group_len] = frame
+        group_len += 1
+
+        if group_len >= group_size or frame_idx == total_frames - 1:
+            final_img, skipped = pipeline.process(to_bgr(group_frames[group_len - 1]))
+            images: list[np.ndarray | None] | None = None
+            if skipped:
+                pipeline.skipped_count += group_len - 1
+            else:
+                images = [None] * group_len
+                if final_img is not None:
+                    images[-1] = final_img.copy()
+                for i in range(group_len - 1):
+                    b_final = pipeline.apply_filters(to_bgr(group_frames[i]))
+                    if b_final is not None:
+                        images[i] = b_final.copy()
+
+            timestamps = group_ts[:group_len].copy()
+            group_frames[:group_len] = [None] * group_len
+            group_len = 0
+            yield frame_idx, timestamps, images
+
 def run_ocr_pipeline(
     video_path: str,
     params: Dict[str, Any],
@@ -26,7 +64,7 @@ def run_ocr_pipeline(
     min_conf = conf_threshold_pct / 100.0
 
     try:
-        video = VideoProvider(video_path, step=1)
+        video = VideoProvider(video_path, step=1, lazy=True)
     except Exception as e:
         logger.error(f"Failed to initialize VideoProvider: {e}")
         raise
@@ -35,64 +73,58 @@ def run_ocr_pipeline(
     reporter.set_total(video.total_frames)
 
     pipeline = ImagePipeline(roi=params.get("roi", [0, 0, 0, 0]), config=config)
-    ocr_engine = get_paddle_engine(lang=str(params.get("languages", "en")), use_gpu=True)
     aggregator = SubtitleAggregator(min_conf=min_conf, fps=video.fps)
     aggregator.on_new_subtitle = reporter.subtitle
 
-    start_time = time.time()
     total_frames = video.total_frames
     step = int(config.get("step", 5))
 
     last_text = ""
     last_conf = 0.0
-    buffer = []
+    groups = BackgroundIterator(_iter_groups(video, pipeline, max(1, step), total_frames), maxsize=8)
 
     try:
-        for frame_idx, timestamp, frame in video:
+        ocr_engine = get_paddle_engine(lang=str(params.get("languages", "en")), use_gpu=True, enable_hpi=bool(params.get("hpi", True)))
+        warmup_pipeline = ImagePipeline(roi=params.get("roi", [0, 0, 0, 0]), config=config)
+        try:
+            warmup_img = warmup_pipeline.apply_filters(np.zeros((video.height, video.width, 3), dtype=np.uint8))
+            if warmup_img is not None:
+                ocr_engine.predict_batch([warmup_img])
+        finally:
+            warmup_pipeline.release()
+
+        start_time = time.monotonic()
+        next_progress_ts = start_time
+
+        for frame_idx, timestamps, images in groups:
             if cancellation.is_cancelled_sync():
                 reporter.log("Process stopped by user.")
                 logger.info("OCR process cancelled by user request.")
                 return False
 
-            buffer.append((frame_idx, timestamp, frame))
-
-            if frame_idx > 0 and frame_idx % 25 == 0:
-                elapsed = time.time() - start_time
-                eta_sec = int((total_frames - frame_idx) * (elapsed / frame_idx))
-                reporter.progress(frame_idx, total_frames, f"{eta_sec // 60:02d}:{eta_sec % 60:02d}")
-
-            if len(buffer) >= step or frame_idx == total_frames - 1:
-                target_frame = buffer[-1][2]
-                final_img, skipped = pipeline.process(target_frame)
-
-                if skipped:
-                    for b_idx, b_ts, b_f in buffer:
-                        aggregator.add_result(last_text, last_conf, b_ts)
-                        if b_idx != frame_idx:
-                            pipeline.skipped_count += 1
-                else:
-                    for i in range(len(buffer) - 1):
-                        b_idx, b_ts, b_f = buffer[i]
-                        b_final = pipeline.apply_filters(b_f)
-                        if b_final is not None:
-                            raw_res = ocr_engine.predict_batch([b_final])
-                            text, conf = PaddleWrapper.parse_results(raw_res[0], min_conf)
-                            last_text, last_conf = text, conf
-                            aggregator.add_result(text, conf, b_ts)
-                        else:
-                            aggregator.add_result("", 0.0, b_ts)
-
-                    if final_img is not None:
-                        raw_res = ocr_engine.predict_batch([final_img])
-                        text, conf = PaddleWrapper.parse_results(raw_res[0], min_conf)
-                        last_text, last_conf = text, conf
-                        aggregator.add_result(text, conf, timestamp)
-                    else:
-                        last_text = ""
-                        last_conf = 0.0
-                        aggregator.add_result("", 0.0, timestamp)
-
-                buffer.clear()
+            ts_list = timestamps.tolist()
+            if images is None:
+                for b_ts in ts_list:
+                    aggregator.add_result(last_text, last_conf, b_ts)
+            else:
+                batch_slots = [i for i, img in enumerate(images) if img is not None]
+                group_results = [("", 0.0)] * len(images)
+                parsed = PaddleWrapper.parse_results_batch(ocr_engine.predict_batch([images[i] for i in batch_slots]), min_conf)
+                for slot, result in zip(batch_slots, parsed):
+                    group_results[slot] = result
+
+                for i in range(len(images) - 1):
+                    text, conf = group_results[i]
+                    aggregator.add_result(text, conf, ts_list[i])
+
+                last_text, last_conf = group_results[-1]
+                aggregator.add_result(last_text, last_conf, ts_list[-1])
+
+            now = time.monotonic()
+            if now >= next_progress_ts and frame_idx > 0:
+                next_progress_ts = now + PROGRESS_INTERVAL
+                eta_min, eta_sec = divmod(int((total_frames - frame_idx) * ((now - start_time) / frame_idx)), 60)
+                reporter.progress(frame_idx, total_frames, f"{eta_min:02d}:{eta_sec:02d}")
 
         aggregator.finalize()
         skip_msg = f"Smart Skip: {pipeline.skipped_count} frames"
@@ -101,4 +133,6 @@ def run_ocr_pipeline(
         logger.info("OCR pipeline completed successfully.")
         return True
     finally:
+        groups.close()
+        pipeline.release()
         video.release()
\ No newline at end of file
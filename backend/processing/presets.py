@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 ConfigType = dict[str, int | float | bool]
@@ -22,7 +24,7 @@ PRESETS_DELTAS: dict[str, dict[str, Any]] = {
     }
 }
 
-SUPPORTED_LANGUAGES: list[dict[str, str]] = [
+SUPPORTED_LANGUAGES: tuple[Mapping[str, str], ...] = tuple(MappingProxyType(lang) for lang in (
     {"code": "en", "name": "English"},
     {"code": "ru", "name": "Russian"},
     {"code": "ch", "name": "Chinese"},
@@ -31,30 +33,36 @@ SUPPORTED_LANGUAGES: list[dict[str, str]] = [
     {"code": "korean", "name": "Korean"},
     {"code": "japan", "name": "Japanese"},
     {"code": "es", "name": "Spanish"}
-]
+))
+
+_LANG_BY_CODE: dict[str, str] = {lang["code"]: lang["name"] for lang in SUPPORTED_LANGUAGES}
+
+_RESOLVED_PRESETS: dict[str, Mapping[str, int | float | bool]] = {
+    preset_id: MappingProxyType({**DEFAULT_CONFIG, **preset_data.get("config", {})})
+    for preset_id, preset_data in PRESETS_DELTAS.items()
+}
+_DEFAULT_VIEW: Mapping[str, int | float | bool] = MappingProxyType(DEFAULT_CONFIG)
 
 def get_preset_config(preset_name: str) -> ConfigType:
-    """Merge default config with preset specific deltas."""
-    config = DEFAULT_CONFIG.copy()
-    preset_data = PRESETS_DELTAS.get(preset_name)
-    if preset_data:
-        config.update(preset_data.get("config", {}))
-    return config
+    """Return a mutable copy of the preset's config, merged with defaults once at import."""
+    return dict(_RESOLVED_PRESETS.get(preset_name, _DEFAULT_VIEW))
 
 def get_all_presets() -> list[dict[str, Any]]:
     """Return a list of all available presets with their full configurations."""
-    presets_list = []
-    for preset_id, preset_data in PRESETS_DELTAS.items():
-        full_config = DEFAULT_CONFIG.copy()
-        full_config.update(preset_data.get("config", {}))
-        presets_list.append({
+    return [
+        {
             "id": preset_id,
             "label": preset_data["label"],
             "desc": preset_data["desc"],
-            "config": full_config
-        })
-    return presets_list
+            "config": dict(_RESOLVED_PRESETS[preset_id])
+        }
+        for preset_id, preset_data in PRESETS_DELTAS.items()
+    ]
+
+def get_supported_languages() -> tuple[Mapping[str, str], ...]:
+    """Return the read-only list of supported languages for OCR."""
+    return SUPPORTED_LANGUAGES
 
-def get_supported_languages() -> list[dict[str, str]]:
-    """Return a list of supported languages for OCR."""
-    return SUPPORTED_LANGUAGES
\ No newline at end of file
+def get_language_name(code: str) -> str | None:
+    """Resolve a language code to its display name."""
+    return _LANG_BY_CODE.get(code)
\ No newline at end of file
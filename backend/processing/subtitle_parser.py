@@ -1,33 +1,29 @@
 import re
 
+_SRT_PATTERN = re.compile(r'(\d+)\n(\d{2}:\d{2}:\d{2}[,.]?\d*) --> (\d{2}:\d{2}:\d{2}[,.]?\d*)\n(.*?)(?=\n\n|\Z)', re.DOTALL)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def _time_to_seconds(t_str: str) -> float:
+    """Convert an SRT timestamp to seconds."""
+    if len(t_str) == 12 and t_str[8] in ',.':
+        return int(t_str[0:2]) * 3600 + int(t_str[3:5]) * 60 + int(t_str[6:8]) + int(t_str[9:12]) * 0.001
+    h, m, s_ms = t_str.replace('.', ',').split(':')
+    s, _, ms = s_ms.partition(',')
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms or 0) / 1000.0
+
 def parse_srt(content: str) -> list[dict]:
     """Parse SRT content into a list of subtitle dictionaries."""
     content = content.replace('\r\n', '\n').replace('\r', '\n')
 
-    pattern = re.compile(r'(\d+)\n(\d{2}:\d{2}:\d{2}[,.]?\d*) --> (\d{2}:\d{2}:\d{2}[,.]?\d*)\n(.*?)(?=\n\n|\Z)', re.DOTALL)
-    tag_pattern = re.compile(r'<[^>]+>')
-
-    matches = pattern.findall(content + '\n\n')
     subtitles = []
-
-    def time_to_seconds(t_str: str) -> float:
-        """Convert time string to seconds."""
-        t_str = t_str.replace('.', ',')
-        if ',' not in t_str:
-            t_str += ',000'
-        h, m, s_ms = t_str.split(':')
-        s, ms = s_ms.split(',')
-        return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000.0
-
     offset = 0.0
 
-    for i, match in enumerate(matches):
-        idx, start_str, end_str, text_block = match
-        clean_text = text_block.strip()
-        clean_text = tag_pattern.sub('', clean_text)
-        
-        start_sec = time_to_seconds(start_str)
-        end_sec = time_to_seconds(end_str)
+    for i, match in enumerate(_SRT_PATTERN.finditer(content + '\n\n')):
+        idx, start_str, end_str, text_block = match.groups()
+        clean_text = _TAG_PATTERN.sub('', text_block).strip() if '<' in text_block else text_block.strip()
+
+        start_sec = _time_to_seconds(start_str)
+        end_sec = _time_to_seconds(end_str)
 
         if i == 0 and start_sec >= 3600:
             hours_offset = int(start_sec // 3600)
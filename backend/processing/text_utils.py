@@ -1,18 +1,43 @@
-import difflib
 import re
 from core.constants import SUBTITLE_SIMILARITY_THRESH
 
+try:
+    from rapidfuzz.distance import Indel
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+_QUOTE_TABLE = str.maketrans({"’": "'", "‘": "'", "`": "'"})
+_PUNCT_PATTERN = re.compile(r'\s*\.{2,}|\s+([.,!?])')
+
+def _punct_repl(match: re.Match) -> str:
+    return match.group(1) or '...'
+
+def _indel_similarity(text1: str, text2: str) -> float:
+    """Pure-Python 2*LCS/(len1+len2), the same score rapidfuzz's normalized Indel similarity returns."""
+    if len(text2) > len(text1):
+        text1, text2 = text2, text1
+    prev = [0] * (len(text2) + 1)
+    for ch in text1:
+        cur = [0]
+        for j, other in enumerate(text2):
+            cur.append(prev[j] + 1 if ch == other else max(prev[j + 1], cur[j]))
+        prev = cur
+    return 2.0 * prev[-1] / (len(text1) + len(text2))
+
 def is_similar(text1: str | None, text2: str | None, threshold: float = SUBTITLE_SIMILARITY_THRESH) -> bool:
-    """Calculate text similarity ratio using SequenceMatcher."""
+    """Compare texts by normalized Indel (LCS) similarity, using rapidfuzz when it is installed."""
     if not text1 or not text2:
         return False
-    return difflib.SequenceMatcher(None, text1, text2).ratio() > threshold
+    len1, len2 = len(text1), len(text2)
+    if 2.0 * min(len1, len2) / (len1 + len2) <= threshold:
+        return False
+    if HAS_RAPIDFUZZ:
+        return Indel.normalized_similarity(text1, text2, score_cutoff=threshold) > threshold
+    return _indel_similarity(text1, text2) > threshold
 
 def normalize_text(text: str) -> str:
     """Clean and normalize OCR text output."""
     if not text:
         return ""
-    text = text.replace("’", "'").replace("‘", "'").replace("`", "'")
-    text = re.sub(r'\.{2,}', '...', text)
-    text = re.sub(r'\s+([.,!?])', r'\1', text)
-    return text.strip()
\ No newline at end of file
+    return _PUNCT_PATTERN.sub(_punct_repl, text.translate(_QUOTE_TABLE)).strip()
\ No newline at end of file
@@ -1,6 +1,8 @@
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from typing import Any
 import logging
+import queue
+import threading
 
 from core.video_io import get_video_metadata, iter_frames
 
@@ -8,10 +10,11 @@ logger = logging.getLogger(__name__)
 
 class VideoProvider:
     """Provides an iterable stream of video frames using PyAV."""
-    def __init__(self, video_path: str, step: int = 1, use_hwaccel: bool = True) -> None:
+    def __init__(self, video_path: str, step: int = 1, use_hwaccel: bool = True, lazy: bool = False) -> None:
         self.video_path = video_path
         self.step = step
         self.use_hwaccel = use_hwaccel
+        self.lazy = lazy
 
         meta = get_video_metadata(video_path)
         self.width = meta["width"]
@@ -26,7 +29,8 @@ class VideoProvider:
             total=self.total_frames,
             width=self.width,
             height=self.height,
-            use_hwaccel=self.use_hwaccel
+            use_hwaccel=self.use_hwaccel,
+            lazy=self.lazy
         )
 
         logger.info("Video %s: %dx%d, %.2f fps, %d frames",
@@ -38,4 +42,55 @@ class VideoProvider:
     def release(self) -> None:
         """Release underlying resources."""
         if self._generator:
-            self._generator.close()
\ No newline at end of file
+            self._generator.close()
+
+_END = object()
+
+class BackgroundIterator:
+    """Drives an iterator on a worker thread so producing items overlaps with consuming them."""
+    def __init__(self, iterable: Iterable[Any], maxsize: int = 32) -> None:
+        self._iterable = iterable
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._slots = threading.Semaphore(maxsize)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            for item in self._iterable:
+                self._slots.acquire()
+                if self._stop.is_set():
+                    break
+                self._queue.put(item)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._queue.put(_END)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self._finished = True
+            self._thread.join()
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        self._slots.release()
+        return item
+
+    def close(self) -> None:
+        """Stop the worker thread, waking it if it is waiting for a free slot."""
+        self._stop.set()
+        self._slots.release()
+        while not self._finished:
+            if self._queue.get() is _END:
+                self._finished = True
+        self._thread.join()
\ No newline at end of file
@@ -1,13 +1,32 @@
 import logging
-from typing import Tuple, Dict, Any, Optional, List
+from typing import Tuple, Dict, Any, Optional, List, Callable
 import functools
+import threading
 import cv2
 import numpy as np
-from core.gpu_utils import has_cuda
+from core.gpu_utils import PinnedBuffer, has_cuda
 from rendering.geometry import calculate_blur_roi, calculate_text_roi
+from rendering.effects.frame_index import FrameRegionIndex
 
 logger = logging.getLogger(__name__)
 
+_SIGNATURE_STRIDE = 8
+_cuda_local = threading.local()
+
+class _CudaBlurContext:
+    """Per-thread stream and page-locked staging buffers for blur transfers."""
+    def __init__(self) -> None:
+        self.stream = cv2.cuda.Stream()
+        self.upload = PinnedBuffer()
+        self.download = PinnedBuffer()
+
+def _get_cuda_context() -> _CudaBlurContext:
+    ctx = getattr(_cuda_local, "ctx", None)
+    if ctx is None:
+        ctx = _CudaBlurContext()
+        _cuda_local.ctx = ctx
+    return ctx
+
 @functools.lru_cache(maxsize=256)
 def _get_cached_mask(bw: int, bh: int, bx: int, by: int, w: int, h: int, eff_feather: int, inner_roi: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
     """Generate and cache the feather mask to avoid redundant GaussianBlur calculations."""
@@ -38,56 +57,72 @@ def _get_cached_mask(bw: int, bh: int, bx: int, by: int, w: int, h: int, eff_fea
     
     return cv2.GaussianBlur(mask, (mask_ksize_val, mask_ksize_val), 0)
 
+@functools.lru_cache(maxsize=64)
+def _get_blend_masks(bw: int, bh: int, bx: int, by: int, w: int, h: int, eff_feather: int, inner_roi: Optional[Tuple[int, int, int, int]], alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Build the 3-channel feather mask and its inverse once per region geometry."""
+    mask = _get_cached_mask(bw, bh, bx, by, w, h, eff_feather, inner_roi) * alpha
+    mask_3ch = cv2.merge([mask, mask, mask])
+    mask_3ch.flags.writeable = False
+    inverse_mask = 1.0 - mask_3ch
+    inverse_mask.flags.writeable = False
+    return mask_3ch, inverse_mask
+
+@functools.lru_cache(maxsize=16)
+def _get_cuda_box_filter(src_type: int, k_size: int) -> Any:
+    """Create the CUDA box filter once per kernel size instead of per frame."""
+    return cv2.cuda.createBoxFilter(src_type, -1, (k_size, k_size))
+
+@functools.lru_cache(maxsize=64)
+def _get_cuda_blend_masks(bw: int, bh: int, bx: int, by: int, w: int, h: int, eff_feather: int, inner_roi: Optional[Tuple[int, int, int, int]], alpha: float) -> Tuple[Any, Any]:
+    """Upload the 3-channel feather mask and its inverse once per region geometry."""
+    mask = _get_cached_mask(bw, bh, bx, by, w, h, eff_feather, inner_roi) * alpha
+    gpu_mask = cv2.cuda_GpuMat()
+    gpu_mask.upload(mask)
+    gpu_mask_3ch = cv2.cuda_GpuMat()
+    cv2.cuda.merge([gpu_mask, gpu_mask, gpu_mask], gpu_mask_3ch)
+    gpu_ones = cv2.cuda_GpuMat(gpu_mask_3ch.size(), gpu_mask_3ch.type(), (1.0, 1.0, 1.0, 0.0))
+    return gpu_mask_3ch, cv2.cuda.subtract(gpu_ones, gpu_mask_3ch)
+
 def _apply_cuda_blur(frame: np.ndarray, roi: Tuple[int, int, int, int], original_roi: np.ndarray, sigma: int, feather: int, alpha: float, inner_roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
-    """Apply GPU-accelerated box blur with cached masking."""
+    """Apply GPU-accelerated box blur, transferring only the ROI through pinned staging on a private stream."""
     bx, by, bw, bh = roi
     h, w = frame.shape[:2]
-    gpu_frame = cv2.cuda_GpuMat()
-    gpu_frame.upload(frame)
+    ctx = _get_cuda_context()
+    stream = ctx.stream
 
-    gpu_roi = cv2.cuda_GpuMat(gpu_frame, (bx, by, bw, bh))
+    staging = ctx.upload.get(original_roi.shape)
+    np.copyto(staging, original_roi)
+    gpu_roi = cv2.cuda_GpuMat()
+    gpu_roi.upload(staging, stream)
 
     if sigma > 0:
-        k_size = sigma * 2 + 1
-        box_filter = cv2.cuda.createBoxFilter(gpu_roi.type(), -1, (k_size, k_size))
-        processed_roi = box_filter.apply(gpu_roi)
-        processed_roi = box_filter.apply(processed_roi)
-        processed_roi = box_filter.apply(processed_roi)
+        box_filter = _get_cuda_box_filter(gpu_roi.type(), sigma * 2 + 1)
+        processed_roi = box_filter.apply(gpu_roi, stream=stream)
+        processed_roi = box_filter.apply(processed_roi, stream=stream)
+        processed_roi = box_filter.apply(processed_roi, stream=stream)
     else:
-        processed_roi = gpu_roi.clone()
+        processed_roi = gpu_roi
 
     if feather > 0 or alpha < 1.0:
         safe_feather_w = int(bw * 0.45)
         safe_feather_h = int(bh * 0.45)
         eff_feather = min(feather, safe_feather_w, safe_feather_h)
 
-        base_mask = _get_cached_mask(bw, bh, bx, by, w, h, eff_feather, inner_roi)
-        mask = base_mask * alpha
-
-        gpu_mask = cv2.cuda_GpuMat()
-        gpu_mask.upload(mask)
-
-        gpu_mask_3ch = cv2.cuda_GpuMat()
-        cv2.cuda.merge([gpu_mask, gpu_mask, gpu_mask], gpu_mask_3ch)
+        gpu_mask_3ch, inverse_mask = _get_cuda_blend_masks(bw, bh, bx, by, w, h, eff_feather, inner_roi, alpha)
 
-        gpu_original_roi = cv2.cuda_GpuMat()
-        gpu_original_roi.upload(original_roi)
+        gpu_original_float = gpu_roi.convertTo(cv2.CV_32FC3, stream)
+        gpu_blur_float = processed_roi.convertTo(cv2.CV_32FC3, stream)
 
-        gpu_original_float = cv2.cuda_GpuMat()
-        gpu_blur_float = cv2.cuda_GpuMat()
-        gpu_original_roi.convertTo(cv2.CV_32FC3, gpu_original_float)
-        processed_roi.convertTo(cv2.CV_32FC3, gpu_blur_float)
+        blended = cv2.cuda.multiply(gpu_blur_float, gpu_mask_3ch, stream=stream)
+        original_part = cv2.cuda.multiply(gpu_original_float, inverse_mask, stream=stream)
+        final_float = cv2.cuda.add(blended, original_part, stream=stream)
+        processed_roi = final_float.convertTo(cv2.CV_8UC3, stream)
 
-        blended = cv2.cuda.multiply(gpu_blur_float, gpu_mask_3ch)
-        gpu_ones = cv2.cuda_GpuMat(gpu_mask_3ch.size(), gpu_mask_3ch.type(), (1.0, 1.0, 1.0, 0.0))
-        inverse_mask = cv2.cuda.subtract(gpu_ones, gpu_mask_3ch)
-        original_part = cv2.cuda.multiply(gpu_original_float, inverse_mask)
-        final_float = cv2.cuda.add(blended, original_part)
-        final_float.convertTo(cv2.CV_8UC3, gpu_roi)
-    else:
-        processed_roi.copyTo(gpu_roi)
-
-    return gpu_frame.download()
+    result = ctx.download.get(original_roi.shape)
+    processed_roi.download(stream, result)
+    stream.waitForCompletion()
+    frame[by:by+bh, bx:bx+bw] = result
+    return frame
 
 def _apply_cpu_blur(frame: np.ndarray, roi: Tuple[int, int, int, int], original_roi: np.ndarray, sigma: int, feather: int, alpha: float, inner_roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
     """Apply CPU-based box blur with cached masking and downscale optimization."""
@@ -121,45 +156,52 @@ def _apply_cpu_blur(frame: np.ndarray, roi: Tuple[int, int, int, int], original_
         safe_feather_h = int(bh * 0.45)
         eff_feather = min(feather, safe_feather_w, safe_feather_h)
 
-        base_mask = _get_cached_mask(bw, bh, bx, by, w, h, eff_feather, inner_roi)
-        mask = base_mask * alpha
-
-        mask_3ch = cv2.merge([mask, mask, mask])
+        mask_3ch, inverse_mask = _get_blend_masks(bw, bh, bx, by, w, h, eff_feather, inner_roi, alpha)
 
         original_float = original_roi.astype(np.float32)
         blur_float = processed_roi.astype(np.float32)
 
-        blended = blur_float * mask_3ch + original_float * (1.0 - mask_3ch)
+        blended = blur_float * mask_3ch + original_float * inverse_mask
         frame[by:by+bh, bx:bx+bw] = blended.astype(np.uint8)
     else:
         frame[by:by+bh, bx:bx+bw] = processed_roi
 
     return frame
 
-def apply_blur_to_frame(frame: np.ndarray, roi: Tuple[int, int, int, int], settings: Dict[str, Any], alpha: float = 1.0, inner_roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
-    """Entry point for applying blur."""
-    bx, by, bw, bh = roi
-    if bw <= 0 or bh <= 0 or alpha <= 0.0:
-        return frame
-
-    original_roi = frame[by:by+bh, bx:bx+bw].copy()
-
+def make_blur_kernel(settings: Dict[str, Any]) -> Callable[..., np.ndarray]:
+    """Resolve blur settings and the backend once and return a per-frame blur function."""
     sigma = int(settings.get('sigma', 5))
     feather = int(settings.get('feather', 30))
+    use_cuda = has_cuda()
+
+    def blur(frame: np.ndarray, roi: Tuple[int, int, int, int], alpha: float = 1.0, inner_roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        bx, by, bw, bh = roi
+        if bw <= 0 or bh <= 0 or alpha <= 0.0:
+            return frame
+
+        original_roi = frame[by:by+bh, bx:bx+bw]
+
+        if use_cuda:
+            try:
+                return _apply_cuda_blur(frame, roi, original_roi, sigma, feather, alpha, inner_roi)
+            except cv2.error:
+                pass
 
-    if has_cuda():
-        try:
-            return _apply_cuda_blur(frame, roi, original_roi, sigma, feather, alpha, inner_roi)
-        except cv2.error:
-            pass
+        return _apply_cpu_blur(frame, roi, original_roi, sigma, feather, alpha, inner_roi)
 
-    return _apply_cpu_blur(frame, roi, original_roi, sigma, feather, alpha, inner_roi)
+    return blur
+
+def apply_blur_to_frame(frame: np.ndarray, roi: Tuple[int, int, int, int], settings: Dict[str, Any], alpha: float = 1.0, inner_roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+    """Entry point for applying blur."""
+    return make_blur_kernel(settings)(frame, roi, alpha, inner_roi)
 
 class BlurEffect:
     """Applies temporal blur regions across frames."""
     def __init__(self, blur_settings: Dict[str, Any]) -> None:
         self.blur_settings = blur_settings
-        self.frame_blur_map: Dict[int, List[Tuple[Tuple[int, int, int, int], Tuple[int, int, int, int]]]] = {}
+        self._blur = make_blur_kernel(blur_settings)
+        self.frame_blur_map = FrameRegionIndex()
+        self._last_blurred: Dict[Tuple[Tuple[int, int, int, int], Tuple[int, int, int, int]], Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]] = {}
 
     async def prepare(
         self,
@@ -172,32 +214,47 @@ class BlurEffect:
     ) -> None:
         """Pre-calculate blur zones."""
         self.frame_blur_map.clear()
+        self._last_blurred.clear()
         blur_dict = self.blur_settings
-        roi_count = 0
         for sub in subtitles:
             text = sub.get('text', '').strip()
             if not text:
                 continue
-            blur_roi = calculate_blur_roi(text, width, height, blur_dict)
             text_roi = calculate_text_roi(text, width, height, blur_dict)
+            blur_roi = calculate_blur_roi(text, width, height, blur_dict, text_roi)
             start_f = max(0, int(sub['start'] * fps) - 1)
             end_f = min(total_frames + 5, int(sub['end'] * fps) + 1)
-            for f_idx in range(start_f, end_f):
-                if f_idx not in self.frame_blur_map:
-                    self.frame_blur_map[f_idx] = []
-                self.frame_blur_map[f_idx].append((blur_roi, text_roi))
-                roi_count += 1
-        logger.info("BlurEffect prepared: %d frame-region entries", roi_count)
+            self.frame_blur_map.add(start_f, end_f, (blur_roi, text_roi))
+        self.frame_blur_map.build()
+        logger.info("BlurEffect prepared: %d frame-region entries", self.frame_blur_map.frame_entries)
 
     def apply(self, frame: np.ndarray, frame_index: int) -> np.ndarray:
-        """Apply effects for the given frame index."""
-        if frame_index not in self.frame_blur_map:
-            return frame
-
-        for blur_roi, text_roi in self.frame_blur_map[frame_index]:
-            frame = apply_blur_to_frame(frame, blur_roi, self.blur_settings, 1.0, text_roi)
+        """Apply effects for the given frame index, reusing the previous result when a region's source is unchanged.
+
+        Regions are compared by a strided subsample first; full copies for the exact check are only kept once the
+        subsample repeats, so moving backgrounds pay for the subsample alone.
+        """
+        blurred = {}
+        for blur_roi, text_roi in self.frame_blur_map.get(frame_index):
+            bx, by, bw, bh = blur_roi
+            key = (blur_roi, text_roi)
+            source = frame[by:by+bh, bx:bx+bw]
+            signature = source[::_SIGNATURE_STRIDE, ::_SIGNATURE_STRIDE].copy()
+            cached = self._last_blurred.get(key)
+            if cached is None or not np.array_equal(cached[0], signature):
+                frame = self._blur(frame, blur_roi, 1.0, text_roi)
+                blurred[key] = (signature, None, None)
+                continue
+            if cached[1] is not None and np.array_equal(cached[1], source):
+                source[...] = cached[2]
+                blurred[key] = cached
+                continue
+            before = source.copy()
+            frame = self._blur(frame, blur_roi, 1.0, text_roi)
+            blurred[key] = (signature, before, frame[by:by+bh, bx:bx+bw].copy())
+        self._last_blurred = blurred
         return frame
 
     def get_debug_info(self) -> Dict[str, Any]:
         """Return debug metadata."""
-        return {"blur_regions": len(self.frame_blur_map)}
\ No newline at end of file
+        return {"blur_regions": self.frame_blur_map.frame_count}
\ No newline at end of file
@@ -0,0 +1,63 @@
+from typing import Any, List, Sequence, Tuple
+import numpy as np
+
+class FrameRegionIndex:
+    """Maps frame indices to the regions active on them using sorted interval arrays."""
+
+    def __init__(self) -> None:
+        self._pending: List[Tuple[int, int, Any]] = []
+        self._payloads: List[Any] = []
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._reach = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.int64)
+
+    def add(self, start: int, end: int, payload: Any) -> None:
+        """Register a payload for frames in the half-open range [start, end)."""
+        if end > start:
+            self._pending.append((start, end, payload))
+
+    def build(self) -> None:
+        """Freeze registered ranges into arrays sorted by start frame."""
+        self._payloads = [payload for _, _, payload in self._pending]
+        starts = np.fromiter((s for s, _, _ in self._pending), dtype=np.int64, count=len(self._pending))
+        ends = np.fromiter((e for _, e, _ in self._pending), dtype=np.int64, count=len(self._pending))
+        self._pending = []
+
+        self._order = np.argsort(starts, kind="stable")
+        self._starts = starts[self._order]
+        self._ends = ends[self._order]
+        self._reach = np.maximum.accumulate(self._ends) if len(self._ends) else self._ends
+
+    def clear(self) -> None:
+        self._pending = []
+        self.build()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    @property
+    def frame_entries(self) -> int:
+        """Total number of (frame, region) pairs covered by the index."""
+        return int((self._ends - self._starts).sum())
+
+    @property
+    def frame_count(self) -> int:
+        """Number of distinct frames with at least one region."""
+        if not len(self._starts):
+            return 0
+        covered = np.zeros(int(self._reach[-1]) + 1, dtype=np.int32)
+        np.add.at(covered, self._starts, 1)
+        np.subtract.at(covered, self._ends, 1)
+        return int(np.count_nonzero(np.cumsum(covered)))
+
+    def get(self, frame_index: int) -> Sequence[Any]:
+        """Return payloads active on the frame, in registration order."""
+        hi = int(np.searchsorted(self._starts, frame_index, side="right"))
+        if hi == 0 or self._reach[hi - 1] <= frame_index:
+            return ()
+        lo = int(np.searchsorted(self._reach[:hi], frame_index, side="right"))
+        hits = self._order[lo:hi][self._ends[lo:hi] > frame_index]
+        if len(hits) > 1:
+            hits.sort()
+        return [self._payloads[i] for i in hits]
\ No newline at end of file
@@ -1,5 +1,6 @@
 import logging
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple
 import cv2
 import numpy as np
@@ -7,6 +8,7 @@ import numpy as np
 from rendering.effects.interface import Effect
 from rendering.geometry import calculate_text_roi
 from rendering.effects.inpainting import generate_text_mask
+from rendering.effects.frame_index import FrameRegionIndex
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,7 @@ except ImportError as e:
 
 _lama_session = None
 _lama_lock = threading.Lock()
+_lama_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lama-loader")
 
 def get_lama_session(model_path: str = "models/lama/lama.onnx"):
     """Global singleton for ONNX inference session."""
@@ -57,17 +60,18 @@ def _pad_to_multiple(img: np.ndarray, mask: np.ndarray, multiple: int = 8) -> Tu
     mask_padded = cv2.copyMakeBorder(mask, 0, pad_h, 0, pad_w, cv2.BORDER_CONSTANT, value=0)
     return img_padded, mask_padded, pad_h, pad_w
 
-def apply_lama_inpaint(frame: np.ndarray, roi: Tuple[int, int, int, int], font_size_px: int) -> np.ndarray:
-    """Applies LaMa inpainting to a specific region."""
+def apply_lama_inpaint(frame: np.ndarray, roi: Tuple[int, int, int, int], font_size_px: int, session: Any = None) -> np.ndarray:
+    """Applies LaMa inpainting to a specific region, loading the shared session when none is passed."""
     x, y, w_roi, h_roi = roi
     if w_roi <= 0 or h_roi <= 0 or ort is None:
         return frame
-    try:
-        session = get_lama_session()
+    if session is None:
+        try:
+            session = get_lama_session()
+        except Exception:
+            return frame
         if session is None:
             return frame
-    except Exception:
-        return frame
 
     bx, by, bw, bh = x, y, w_roi, h_roi
     pad = max(10, int(font_size_px * 0.5))
@@ -121,7 +125,8 @@ class LaMaInpaintEffect(Effect):
     def __init__(self, blur_settings: Dict[str, Any]) -> None:
         self.blur_settings = blur_settings
         self.font_size_px = int(blur_settings.get('font_size', 21))
-        self.frame_inpaint_map: Dict[int, List[Tuple[Tuple[int, int, int, int], int]]] = {}
+        self.frame_inpaint_map = FrameRegionIndex()
+        self._session_future: Future | None = None
 
     async def prepare(
         self,
@@ -132,13 +137,13 @@ class LaMaInpaintEffect(Effect):
         total_frames: int,
         video_path: str,
     ) -> None:
-        """Initializes session and maps frames."""
+        """Maps frames and starts loading the session in the background when any frame needs it."""
+        self._session_future = None
         if self.blur_settings.get('mode') != 'lama' or ort is None:
             self.frame_inpaint_map.clear()
             return
 
         self.frame_inpaint_map.clear()
-        get_lama_session()
 
         for sub in subtitles:
             text = sub.get('text', '').strip()
@@ -151,21 +156,24 @@ class LaMaInpaintEffect(Effect):
             start_f = max(0, int(sub['start'] * fps) - 1)
             end_f = min(total_frames + 5, int(sub['end'] * fps) + 1)
             sub_id = sub.get('id', -1)
-            for f_idx in range(start_f, end_f):
-                if f_idx not in self.frame_inpaint_map:
-                    self.frame_inpaint_map[f_idx] = []
-                self.frame_inpaint_map[f_idx].append((roi, sub_id))
+            self.frame_inpaint_map.add(start_f, end_f, (roi, sub_id))
+        self.frame_inpaint_map.build()
+        if len(self.frame_inpaint_map):
+            self._session_future = _lama_loader.submit(get_lama_session)
 
     def apply(self, frame: np.ndarray, frame_index: int) -> np.ndarray:
-        """Applies inpaint to target frames."""
-        if frame_index not in self.frame_inpaint_map:
+        """Applies inpaint to target frames; waits for the session load and re-raises its failure."""
+        regions = self.frame_inpaint_map.get(frame_index)
+        if not regions or self._session_future is None:
             return frame
-
-        for roi, _ in self.frame_inpaint_map[frame_index]:
-            frame = apply_lama_inpaint(frame, roi, self.font_size_px)
+        session = self._session_future.result()
+        if session is None:
+            raise RuntimeError("LaMa ONNX session is unavailable.")
+        for roi, _ in regions:
+            frame = apply_lama_inpaint(frame, roi, self.font_size_px, session)
 
         return frame
 
     def get_debug_info(self) -> Dict[str, Any]:
         """Returns debug information."""
-        return {"lama_inpaint_regions": len(self.frame_inpaint_map)}
\ No newline at end of file
+        return {"lama_inpaint_regions": self.frame_inpaint_map.frame_count}
\ No newline at end of file
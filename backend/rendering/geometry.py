@@ -1,6 +1,23 @@
+import functools
 import math
 import re
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
+
+_WIDTH_CLASSES = (
+    (re.compile(r'[\u4e00-\u9fa5\u3040-\u30ff\uac00-\ud7af\uff00-\uffef]'), 1.1),
+    (re.compile(r'[mwWM@OQG]'), 0.95),
+    (re.compile(r'[A-Z]'), 0.8),
+    (re.compile(r'[0-9]'), 0.65),
+    (re.compile(r'[il1.,!I|:;tfj]'), 0.35),
+)
+
+@functools.lru_cache(maxsize=4096)
+def _char_width(char: str) -> float:
+    """Relative advance of a character in em units."""
+    for pattern, char_width in _WIDTH_CLASSES:
+        if pattern.match(char):
+            return char_width
+    return 0.65
 
 def estimate_text_width(text: str, font_size: int, width_multiplier: float) -> int:
     """Calculate the approximate width of a text string in pixels."""
@@ -9,18 +26,7 @@ def estimate_text_width(text: str, font_size: int, width_multiplier: float) -> i
 
     width = 0.0
     for char in text:
-        if re.match(r'[\u4e00-\u9fa5\u3040-\u30ff\uac00-\ud7af\uff00-\uffef]', char):
-            width += 1.1
-        elif re.match(r'[mwWM@OQG]', char):
-            width += 0.95
-        elif re.match(r'[A-Z]', char):
-            width += 0.8
-        elif re.match(r'[0-9]', char):
-            width += 0.65
-        elif re.match(r'[il1.,!I|:;tfj]', char):
-            width += 0.35
-        else:
-            width += 0.65
+        width += _char_width(char)
 
     return int(math.ceil(width * font_size * width_multiplier))
 
@@ -58,13 +64,16 @@ def calculate_text_roi(text: str, width: int, height: int, settings: Dict[str, A
 
     return final_x, final_y, final_w, final_h
 
-def calculate_blur_roi(text: str, width: int, height: int, settings: Dict[str, Any]) -> Tuple[int, int, int, int]:
-    """Calculate the coordinates of the adaptive blur region (red area) preventing sharp edges."""
+def calculate_blur_roi(text: str, width: int, height: int, settings: Dict[str, Any], text_roi: Optional[Tuple[int, int, int, int]] = None) -> Tuple[int, int, int, int]:
+    """Calculate the coordinates of the adaptive blur region (red area) preventing sharp edges.
+
+    Callers that already computed the text rectangle can pass it as text_roi to skip the width estimate.
+    """
     if not text:
         return 0, 0, 0, 0
 
     font_size_px = int(settings.get('font_size', 21))
-    tx, ty, tw, th = calculate_text_roi(text, width, height, settings)
+    tx, ty, tw, th = text_roi if text_roi is not None else calculate_text_roi(text, width, height, settings)
 
     feather = int(settings.get('feather', 30))
 
@@ -6,6 +6,7 @@ class Reporter(Protocol):
     def done(self, total: int) -> None: ...
 
 class Storage(Protocol):
+    async def exists(self, key: str) -> bool: ...
     async def download(self, key: str, dest: str) -> bool: ...
     async def upload(self, src: str, key: str) -> bool: ...
 
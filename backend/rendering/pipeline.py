@@ -10,6 +10,7 @@ from rendering.models import RenderTaskConfig
 from rendering.effects.interface import Effect
 from rendering.video_writer import AsyncVideoWriter
 from rendering.transcoder import FFmpegTranscoder
+from core.constants import PROGRESS_INTERVAL
 from core.exceptions import TaskCancelledError
 from core.video_io import get_video_dar, get_video_metadata, iter_frames
 
@@ -27,6 +28,7 @@ def _process_frames_sync(
     cancellation: CancellationToken
 ) -> int:
     frame_idx = 0
+    next_progress_ts = time.monotonic() + PROGRESS_INTERVAL
     for f_idx, _, frame in iter_frames(local_video_path, step=1, fps=fps, total=total_frames, width=width, height=height, use_hwaccel=True):
         if cancellation.is_cancelled_sync():
             raise TaskCancelledError("User cancelled during frame writing")
@@ -36,7 +38,9 @@ def _process_frames_sync(
 
         writer.write(frame)
 
-        if frame_idx > 0 and frame_idx % 25 == 0:
+        now = time.monotonic()
+        if now >= next_progress_ts:
+            next_progress_ts = now + PROGRESS_INTERVAL
             reporter.progress(frame_idx, total_frames, "N/A")
 
         frame_idx += 1
@@ -2,10 +2,24 @@ import asyncio
 import os
 import logging
 from typing import List, Optional
+import av
 from rendering.interfaces import CancellationToken
 
 logger = logging.getLogger(__name__)
 
+CANCEL_POLL_INTERVAL = 1.0
+COPYABLE_AUDIO_CODECS = frozenset({"aac", "mp3", "ac3", "eac3", "alac"})
+
+def _probe_audio_codec(path: str) -> Optional[str]:
+    """Name of the first audio stream's codec, or None when there is none or probing fails."""
+    try:
+        with av.open(path) as container:
+            if not container.streams.audio:
+                return None
+            return container.streams.audio[0].codec_context.name
+    except Exception:
+        return None
+
 class FFmpegTranscoder:
     """Handles video multiplexing and asynchronous command execution."""
     
@@ -15,21 +29,20 @@ class FFmpegTranscoder:
         process = await asyncio.create_subprocess_exec(
             *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
         )
+        wait_task = asyncio.ensure_future(process.wait())
         try:
-            while True:
-                if cancel and cancel.is_cancelled_sync():
+            if cancel is None:
+                await wait_task
+            while not wait_task.done():
+                if cancel.is_cancelled_sync():
                     process.terminate()
                     try:
-                        await asyncio.wait_for(process.wait(), timeout=2.0)
+                        await asyncio.wait_for(asyncio.shield(wait_task), timeout=2.0)
                     except asyncio.TimeoutError:
                         process.kill()
-                        await process.wait()
+                        await wait_task
                     raise asyncio.CancelledError("Transcoding cancelled")
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=0.5)
-                    break
-                except asyncio.TimeoutError:
-                    continue
+                await asyncio.wait({wait_task}, timeout=CANCEL_POLL_INTERVAL)
         except asyncio.CancelledError:
             if process.returncode is None:
                 process.kill()
@@ -55,23 +68,31 @@ class FFmpegTranscoder:
         """Muxes the generated video with the original audio without re-encoding the video stream."""
         logger.info("Muxing video with original audio...")
 
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", temp_video,
-            "-i", original_video,
-            "-map", "0:v:0",
-            "-map", "1:a:0?",
-            "-c:v", "copy",
-            "-c:a", "aac",
-            "-shortest"
-        ]
-
-        if dar is not None:
-            cmd.extend(["-aspect", f"{dar:.6f}"])
+        def build_cmd(audio_codec: str) -> List[str]:
+            cmd = [
+                "ffmpeg", "-y",
+                "-i", temp_video,
+                "-i", original_video,
+                "-map", "0:v:0",
+                "-map", "1:a:0?",
+                "-c:v", "copy",
+                "-c:a", audio_codec,
+                "-shortest"
+            ]
+            if dar is not None:
+                cmd.extend(["-aspect", f"{dar:.6f}"])
+            cmd.append(output_path)
+            return cmd
 
-        cmd.append(output_path)
-        
-        await FFmpegTranscoder.run_cmd(cmd, cancel=cancel)
+        source_audio = await asyncio.to_thread(_probe_audio_codec, original_video)
+        if source_audio in COPYABLE_AUDIO_CODECS:
+            try:
+                await FFmpegTranscoder.run_cmd(build_cmd("copy"), cancel=cancel)
+            except RuntimeError as e:
+                logger.warning(f"Audio stream copy of {source_audio} failed ({e}), re-encoding to AAC")
+                await FFmpegTranscoder.run_cmd(build_cmd("aac"), cancel=cancel)
+        else:
+            await FFmpegTranscoder.run_cmd(build_cmd("aac"), cancel=cancel)
 
         if os.path.exists(temp_video):
             os.remove(temp_video)
@@ -3,7 +3,7 @@ import queue
 import av
 import numpy as np
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 from fractions import Fraction
 
 logger = logging.getLogger(__name__)
@@ -14,6 +14,8 @@ class AsyncVideoWriter:
         self.path = path
         self._queue = queue.Queue(maxsize=100)
         self._running = True
+        self._error: Optional[Exception] = None
+        self._error_raised = False
         self.container = av.open(path, 'w')
         
         selected_encoder = "h264_nvenc" if encoder in ["auto", "nvenc"] else "libx264"
@@ -33,36 +35,52 @@ class AsyncVideoWriter:
 
     def _run(self):
         """Background thread for encoding."""
-        while self._running or not self._queue.empty():
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
             try:
-                frame = self._queue.get(timeout=0.1)
-                if frame is None:
-                    break
                 av_frame = av.VideoFrame.from_ndarray(frame, format='bgr24')
                 for packet in self.stream.encode(av_frame):
                     self.container.mux(packet)
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.error(f"Encoding error: {e}")
+                self._error = e
+                while self._queue.get() is not None:
+                    pass
                 break
         
         try:
-            for packet in self.stream.encode():
-                self.container.mux(packet)
-        except Exception:
-            pass
+            if self._error is None:
+                for packet in self.stream.encode():
+                    self.container.mux(packet)
+        except Exception as e:
+            logger.error(f"Encoder flush error: {e}")
+            self._error = e
+
+        try:
+            self.container.close()
+        except Exception as e:
+            logger.error(f"Failed to finalize {self.path}: {e}")
+            if self._error is None:
+                self._error = e
 
-        self.container.close()
+    def _raise_if_failed(self):
+        """Surface an encoder thread failure to the caller once."""
+        if self._error is not None and not self._error_raised:
+            self._error_raised = True
+            raise RuntimeError(f"Video encoding failed: {self._error}") from self._error
 
     def write(self, frame: np.ndarray):
         """Queues a new frame for encoding."""
         if not self._running:
             raise RuntimeError("Writer is closed")
+        self._raise_if_failed()
         self._queue.put(frame)
 
     def close(self):
         """Safely closes the writer stream."""
         self._running = False
         self._queue.put(None)
-        self._thread.join()
\ No newline at end of file
+        self._thread.join()
+        self._raise_if_failed()
\ No newline at end of file
@@ -0,0 +1,40 @@
+import asyncio
+import numpy as np
+import pytest
+from rendering.effects.blur import BlurEffect
+
+SETTINGS = {"mode": "blur", "y": 200, "font_size": 30, "sigma": 5, "feather": 40, "width_multiplier": 1.0, "height_multiplier": 1.2}
+SUBTITLES = [{"id": 1, "text": "A subtitle line", "start": 0.0, "end": 10.0}]
+
+@pytest.fixture
+def effect():
+    blur = BlurEffect(SETTINGS)
+    asyncio.run(blur.prepare(SUBTITLES, 640, 360, 25.0, 250, ""))
+    return blur
+
+def _uncached(effect: BlurEffect, frame: np.ndarray, frame_index: int) -> np.ndarray:
+    frame = frame.copy()
+    for blur_roi, text_roi in effect.frame_blur_map.get(frame_index):
+        frame = effect._blur(frame, blur_roi, 1.0, text_roi)
+    return frame
+
+def _frames(effect: BlurEffect) -> list[np.ndarray]:
+    """Static frames, a change the strided signature cannot see, then a moving background."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (360, 640, 3), dtype=np.uint8)
+    (bx, by, _, _), _ = effect.frame_blur_map.get(10)[0]
+    off_grid = base.copy()
+    off_grid[by + 1, bx + 1] ^= 0xFF
+    return [base, base, base, off_grid, off_grid, np.roll(base, 3, axis=1), base]
+
+def test_cached_output_matches_uncached_blur(effect):
+    for frame_index, frame in enumerate(_frames(effect), start=10):
+        expected = _uncached(effect, frame, frame_index)
+        np.testing.assert_array_equal(effect.apply(frame.copy(), frame_index), expected)
+
+def test_moving_background_keeps_no_full_copies(effect):
+    rng = np.random.default_rng(1)
+    for frame_index in range(10, 14):
+        effect.apply(rng.integers(0, 256, (360, 640, 3), dtype=np.uint8), frame_index)
+    assert effect._last_blurred
+    assert all(before is None and after is None for _, before, after in effect._last_blurred.values())
\ No newline at end of file
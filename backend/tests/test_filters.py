@@ -0,0 +1,43 @@
+import cv2
+import pytest
+import core.filters as filters
+
+class FakeCudaOps:
+    """Stands in for the cv2.cuda kernels with their real signatures, recording how they were called."""
+    def __init__(self) -> None:
+        self.denoise_calls: list[dict] = []
+        self.resize_calls: list[tuple] = []
+
+    def fastNlMeansDenoisingColored(self, src, h_luminance, photo_render, dst=None, search_window=21, block_size=7, stream=None):
+        if dst is not None and not isinstance(dst, cv2.cuda_GpuMat):
+            raise cv2.error("dst must be a GpuMat")
+        self.denoise_calls.append({"h": (h_luminance, photo_render), "dst": dst, "search_window": search_window, "block_size": block_size})
+        return cv2.cuda_GpuMat()
+
+    def resize(self, src, dsize, interpolation=cv2.INTER_LINEAR):
+        self.resize_calls.append((dsize, interpolation))
+        return cv2.cuda_GpuMat()
+
+@pytest.fixture
+def cuda_ops(monkeypatch):
+    ops = FakeCudaOps()
+    monkeypatch.setattr(filters, "has_cuda", lambda: True)
+    monkeypatch.setattr(cv2.cuda, "fastNlMeansDenoisingColored", ops.fastNlMeansDenoisingColored, raising=False)
+    monkeypatch.setattr(cv2.cuda, "resize", ops.resize, raising=False)
+    monkeypatch.setattr(filters, "ensure_cpu", lambda frame: pytest.fail("CUDA branch fell back to the CPU"))
+    return ops
+
+def test_cuda_denoise_stays_on_device(cuda_ops):
+    gpu_frame = cv2.cuda_GpuMat()
+    result = filters.denoise_frame(gpu_frame, strength=3.0)
+
+    assert isinstance(result, cv2.cuda_GpuMat)
+    assert cuda_ops.denoise_calls == [{"h": (3.0, 3.0), "dst": None, "search_window": 21, "block_size": 7}]
+
+def test_cuda_denoise_then_scale_chain_stays_on_device(cuda_ops):
+    processed = filters.denoise_frame(cv2.cuda_GpuMat(), strength=3.0)
+    processed = filters.apply_scaling(processed, scale_factor=2.0)
+
+    assert isinstance(processed, cv2.cuda_GpuMat)
+    assert len(cuda_ops.denoise_calls) == 1
+    assert cuda_ops.resize_calls == [((0, 0), cv2.INTER_CUBIC)]
\ No newline at end of file
@@ -0,0 +1,48 @@
+import asyncio
+import types
+import numpy as np
+import pytest
+from rendering.effects import lama
+
+SUBTITLES = [{"id": 1, "text": "Hello there", "start": 1.0, "end": 2.0}]
+
+@pytest.fixture
+def effect(monkeypatch):
+    monkeypatch.setattr(lama, "ort", types.SimpleNamespace())
+    return lama.LaMaInpaintEffect({"mode": "lama", "font_size": 30, "y": 200})
+
+def _prepare(effect: lama.LaMaInpaintEffect, subtitles: list) -> None:
+    asyncio.run(effect.prepare(subtitles=subtitles, width=640, height=360, fps=25.0, total_frames=100, video_path="unused.mp4"))
+
+def test_failed_model_load_fails_the_render_once(effect, monkeypatch):
+    calls = []
+
+    def _broken_session():
+        calls.append(1)
+        raise RuntimeError("model file missing")
+
+    monkeypatch.setattr(lama, "get_lama_session", _broken_session)
+    _prepare(effect, SUBTITLES)
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+
+    assert effect.apply(frame, 0) is frame
+    for frame_index in (30, 31):
+        with pytest.raises(RuntimeError, match="model file missing"):
+            effect.apply(frame, frame_index)
+    assert len(calls) == 1
+
+def test_loaded_session_is_passed_to_each_region(effect, monkeypatch):
+    session = object()
+    seen = []
+    monkeypatch.setattr(lama, "get_lama_session", lambda: session)
+    monkeypatch.setattr(lama, "apply_lama_inpaint", lambda frame, roi, font_size_px, sess: seen.append(sess) or frame)
+    _prepare(effect, SUBTITLES)
+
+    effect.apply(np.zeros((360, 640, 3), dtype=np.uint8), 30)
+    assert seen == [session]
+
+def test_no_lama_frames_skips_model_load(effect, monkeypatch):
+    monkeypatch.setattr(lama, "get_lama_session", lambda: pytest.fail("model must not load without LaMa frames"))
+    _prepare(effect, [])
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    assert effect.apply(frame, 30) is frame
\ No newline at end of file
@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+import pytest
+import core.motion as motion
+from core.constants import MOTION_MSE_THRESH
+from core.gpu_utils import ensure_cpu, has_cuda
+
+def _frames(seed: int, count: int = 8, shape: tuple[int, int] = (120, 320)) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (*shape, 3), dtype=np.uint8)
+    frames = [base]
+    for i in range(1, count):
+        noisy = base.astype(np.int16) + rng.integers(-i * 4, i * 4 + 1, base.shape, dtype=np.int16)
+        frames.append(np.clip(noisy, 0, 255).astype(np.uint8))
+    return frames
+
+def _cpu_signature(img: np.ndarray, monkeypatch: pytest.MonkeyPatch) -> np.ndarray:
+    with monkeypatch.context() as m:
+        m.setattr(motion, "has_cuda", lambda: False)
+        return motion.compute_motion_signature(img)
+
+def test_identical_frames_do_not_register_change(monkeypatch):
+    frame = _frames(0, count=1)[0]
+    sig = _cpu_signature(frame, monkeypatch)
+    assert not motion.detect_change_signature(sig, sig.copy())
+
+def test_cpu_mse_matches_reference_definition(monkeypatch):
+    frames = _frames(1)
+    sigs = [_cpu_signature(f, monkeypatch) for f in frames]
+    for a, b in zip(sigs, sigs[1:]):
+        mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+        assert motion.detect_change_signature(a, b) == (mse > MOTION_MSE_THRESH)
+
+@pytest.mark.skipif(not has_cuda(), reason="CUDA device not available")
+def test_cuda_signature_matches_cpu_within_one_level(monkeypatch):
+    """Box filter rounding may differ by one grey level between backends; Smart Skip decisions must not."""
+    frames = _frames(2)
+    cpu_sigs = [_cpu_signature(f, monkeypatch) for f in frames]
+    gpu_sigs = [motion.compute_motion_signature(f) for f in frames]
+    assert all(isinstance(s, cv2.cuda_GpuMat) for s in gpu_sigs)
+
+    for cpu_sig, gpu_sig in zip(cpu_sigs, gpu_sigs):
+        diff = cv2.absdiff(cpu_sig, ensure_cpu(gpu_sig))
+        assert int(diff.max()) <= 1
+
+    for i in range(len(frames) - 1):
+        assert motion.detect_change_signature(gpu_sigs[i], gpu_sigs[i + 1]) == motion.detect_change_signature(cpu_sigs[i], cpu_sigs[i + 1])
\ No newline at end of file
@@ -0,0 +1,55 @@
+import sys
+import types
+import numpy as np
+import pytest
+from processing.ocr_engine import PaddleWrapper
+
+class FakePaddleOCR:
+    """Test double for paddleocr.PaddleOCR; the HPI variant can be told to fail at inference time."""
+    hpi_predict_error: Exception | None = None
+
+    def __init__(self, **kwargs) -> None:
+        self.hpi = kwargs.get("enable_hpi", False)
+        self.calls = 0
+
+    def predict(self, frames):
+        self.calls += 1
+        if self.hpi and FakePaddleOCR.hpi_predict_error is not None:
+            raise FakePaddleOCR.hpi_predict_error
+        batch = frames if isinstance(frames, list) else [frames]
+        return [{"rec_texts": [f"line {i}"], "rec_scores": [0.9], "rec_boxes": []} for i in range(len(batch))]
+
+@pytest.fixture
+def fake_paddleocr(monkeypatch):
+    FakePaddleOCR.hpi_predict_error = None
+    monkeypatch.setitem(sys.modules, "paddleocr", types.SimpleNamespace(PaddleOCR=FakePaddleOCR))
+    monkeypatch.setitem(sys.modules, "paddle", None)
+    return FakePaddleOCR
+
+def _frames(n: int) -> list[np.ndarray]:
+    return [np.zeros((32, 64, 3), dtype=np.uint8) for _ in range(n)]
+
+def test_batch_runs_in_one_predict_call(fake_paddleocr):
+    engine = PaddleWrapper(use_gpu=True)
+    results = engine.predict_batch(_frames(3))
+    assert engine.ocr.calls == 1
+    assert PaddleWrapper.parse_results_batch(results, 0.5) == [("line 0", 0.9), ("line 1", 0.9), ("line 2", 0.9)]
+
+def test_hpi_failure_on_first_predict_falls_back_to_default_backend(fake_paddleocr):
+    fake_paddleocr.hpi_predict_error = RuntimeError("TensorRT engine build failed")
+    engine = PaddleWrapper(use_gpu=True)
+    assert engine.ocr.hpi
+
+    results = engine.predict_batch(_frames(2))
+
+    assert not engine.ocr.hpi
+    assert PaddleWrapper.parse_results_batch(results, 0.5) == [("line 0", 0.9), ("line 1", 0.9)]
+
+def test_frame_errors_after_hpi_is_verified_do_not_swap_backend(fake_paddleocr):
+    engine = PaddleWrapper(use_gpu=True)
+    engine.predict_batch(_frames(1))
+    hpi_engine = engine.ocr
+
+    fake_paddleocr.hpi_predict_error = RuntimeError("bad frame")
+    assert engine.predict_batch(_frames(1)) == [None]
+    assert engine.ocr is hpi_engine
\ No newline at end of file
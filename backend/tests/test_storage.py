@@ -0,0 +1,55 @@
+import asyncio
+import io
+import threading
+import pytest
+from core.storage import StorageManager
+
+@pytest.fixture
+def storage(tmp_path):
+    return StorageManager(upload_dir=str(tmp_path / "uploads"), temp_dir=str(tmp_path / ".temp"))
+
+def test_file_exists(storage, tmp_path):
+    (tmp_path / "uploads" / "present.mp4").write_bytes(b"data")
+    assert asyncio.run(storage.file_exists("present.mp4"))
+    assert not asyncio.run(storage.file_exists("missing.mp4"))
+
+def test_chunks_land_at_their_offsets(storage, tmp_path):
+    async def _upload() -> bool:
+        chunks = [(b"cc", 4), (b"aa", 0), (b"bb", 2)]
+        results = await asyncio.gather(*(storage.save_chunk("video.mp4", io.BytesIO(data), offset) for data, offset in chunks))
+        return all(results) and await storage.complete_local_upload("video.mp4")
+
+    assert asyncio.run(_upload())
+    assert (tmp_path / "uploads" / "video.mp4").read_bytes() == b"aabbcc"
+    assert not (tmp_path / ".temp" / "video.mp4").exists()
+
+def test_completion_waits_for_in_flight_chunk(storage, tmp_path):
+    release = threading.Event()
+
+    class SlowChunk(io.BytesIO):
+        def read(self, size: int = -1) -> bytes:
+            release.wait(5)
+            return super().read(size)
+
+    async def _upload() -> tuple[bool, bool]:
+        assert await storage.save_chunk("video.mp4", io.BytesIO(b"aa"), 0)
+        writer = asyncio.create_task(storage.save_chunk("video.mp4", SlowChunk(b"bb"), 2))
+        await asyncio.sleep(0.05)
+        completer = asyncio.create_task(storage.complete_local_upload("video.mp4"))
+        await asyncio.sleep(0.05)
+        assert not completer.done()
+        release.set()
+        return await writer, await completer
+
+    assert asyncio.run(_upload()) == (True, True)
+    assert (tmp_path / "uploads" / "video.mp4").read_bytes() == b"aabb"
+
+def test_late_chunk_is_rejected_without_orphan(storage, tmp_path):
+    async def _upload() -> bool:
+        assert await storage.save_chunk("video.mp4", io.BytesIO(b"aa"), 0)
+        assert await storage.complete_local_upload("video.mp4")
+        return await storage.save_chunk("video.mp4", io.BytesIO(b"bb"), 2)
+
+    assert not asyncio.run(_upload())
+    assert (tmp_path / "uploads" / "video.mp4").read_bytes() == b"aa"
+    assert not (tmp_path / ".temp" / "video.mp4").exists()
\ No newline at end of file
@@ -0,0 +1,49 @@
+import pytest
+from processing import text_utils
+from processing.text_utils import _indel_similarity, is_similar
+
+# Borderline subtitle pairs around SUBTITLE_SIMILARITY_THRESH (0.6) with their Indel score and the decision it pins.
+# The first pair scored 0.514 under difflib.SequenceMatcher and was kept apart; Indel's optimal alignment now merges it.
+BORDERLINE_PAIRS = [
+    ("What is this place?", "What did he say?", 0.629, True),
+    ("Be ca", "Be careful.", 0.625, True),
+    ("To the ", "To the station.", 0.636, True),
+    ("You have to believe me.", "Please don't leave me.", 0.578, False),
+    ("Where were you last night?", "Then who turned on the lights?", 0.571, False),
+    ("Then who turned on the lights?", "Are you sure about this?", 0.556, False),
+]
+
+OCR_NOISE_PAIRS = [
+    ("I don't know what you're talking about.", "I don't knovv what you're ta1king about."),
+    ("We need to get out of here now!", "We need to get out of hcre now!"),
+    ("Nobody has been here for years.", "Nobody has been here for years"),
+]
+
+@pytest.mark.parametrize("text1,text2,score,expected", BORDERLINE_PAIRS)
+def test_borderline_pairs(monkeypatch, text1, text2, score, expected):
+    monkeypatch.setattr(text_utils, "HAS_RAPIDFUZZ", False)
+    assert _indel_similarity(text1, text2) == pytest.approx(score, abs=1e-3)
+    assert is_similar(text1, text2) is expected
+    assert is_similar(text2, text1) is expected
+
+@pytest.mark.parametrize("text1,text2", OCR_NOISE_PAIRS)
+def test_ocr_noise_still_matches(monkeypatch, text1, text2):
+    monkeypatch.setattr(text_utils, "HAS_RAPIDFUZZ", False)
+    assert is_similar(text1, text2)
+    assert is_similar(text1, text2, 0.8)
+
+def test_empty_and_length_mismatch(monkeypatch):
+    monkeypatch.setattr(text_utils, "HAS_RAPIDFUZZ", False)
+    assert not is_similar("", "Thank you.")
+    assert not is_similar(None, "Thank you.")
+    assert not is_similar("Yes", "Yes, we will. Trust me.")
+    assert not is_similar("Thank you.", "Thank you so much.", 0.8)
+
+@pytest.mark.parametrize("text1,text2", [(a, b) for a, b, _, _ in BORDERLINE_PAIRS] + OCR_NOISE_PAIRS)
+def test_rapidfuzz_matches_fallback(monkeypatch, text1, text2):
+    pytest.importorskip("rapidfuzz")
+    for threshold in (0.6, 0.8):
+        monkeypatch.setattr(text_utils, "HAS_RAPIDFUZZ", True)
+        fast = is_similar(text1, text2, threshold)
+        monkeypatch.setattr(text_utils, "HAS_RAPIDFUZZ", False)
+        assert fast is is_similar(text1, text2, threshold)
\ No newline at end of file
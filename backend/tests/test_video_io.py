@@ -0,0 +1,57 @@
+import threading
+import av
+import numpy as np
+import pytest
+import core.video_io as video_io
+
+def _write_clip(path: str, frames: int = 30) -> list[np.ndarray]:
+    with av.open(path, "w") as container:
+        stream = container.add_stream("mpeg4", rate=25)
+        stream.width, stream.height, stream.pix_fmt = 64, 48, "yuv420p"
+        for i in range(frames):
+            img = np.full((48, 64, 3), (i * 8) % 256, dtype=np.uint8)
+            for packet in stream.encode(av.VideoFrame.from_ndarray(img, format="bgr24")):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    with av.open(path) as container:
+        return [f.to_ndarray(format="bgr24") for f in container.decode(video=0)]
+
+@pytest.fixture
+def clips(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_io, "_readers", type(video_io._readers)())
+    paths = [str(tmp_path / f"clip{i}.mp4") for i in range(video_io.MAX_OPEN_READERS + 1)]
+    return {path: _write_clip(path) for path in paths}
+
+def test_readers_return_exact_frames_across_videos(clips):
+    for frame_index in (0, 5, 29, 3):
+        for path, frames in clips.items():
+            np.testing.assert_array_equal(video_io._read_frame(path, frame_index), frames[frame_index])
+    assert len(video_io._readers) == video_io.MAX_OPEN_READERS
+
+def test_cold_open_does_not_block_open_readers(clips, monkeypatch):
+    warm, cold = list(clips)[:2]
+    video_io._read_frame(warm, 0)
+
+    opening = threading.Event()
+    release = threading.Event()
+    open_input = video_io._open_input
+
+    def _slow_open(path, use_hwaccel=False):
+        if path == cold:
+            opening.set()
+            release.wait(5)
+        return open_input(path, use_hwaccel)
+
+    monkeypatch.setattr(video_io, "_open_input", _slow_open)
+    opener = threading.Thread(target=video_io._read_frame, args=(cold, 0))
+    opener.start()
+    try:
+        assert opening.wait(5)
+        reader = threading.Thread(target=video_io._read_frame, args=(warm, 1))
+        reader.start()
+        reader.join(2)
+        assert not reader.is_alive()
+    finally:
+        release.set()
+        opener.join(5)
\ No newline at end of file
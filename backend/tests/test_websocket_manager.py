@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+
+pytest.importorskip("fastapi")
+
+from api.websockets.manager import ConnectionManager
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False) -> None:
+        self.sent: list[tuple[str, object]] = []
+        self.fail = fail
+
+    async def send_text(self, text: str) -> None:
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(("text", text))
+
+    async def send_json(self, message: dict) -> None:
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(("json", message))
+
+def test_send_json_and_text_share_one_path():
+    manager = ConnectionManager()
+    websocket = FakeWebSocket()
+    manager.active_connections["client"] = websocket
+
+    asyncio.run(manager.send_json("client", {"type": "pong"}))
+    asyncio.run(manager.send_text("client", '{"type":"progress"}'))
+    asyncio.run(manager.send_text("missing", "ignored"))
+
+    assert websocket.sent == [("json", {"type": "pong"}), ("text", '{"type":"progress"}')]
+
+def test_send_failures_are_logged_not_raised(caplog):
+    manager = ConnectionManager()
+    manager.active_connections["client"] = FakeWebSocket(fail=True)
+
+    asyncio.run(manager.send_text("client", "{}"))
+    asyncio.run(manager.send_json("client", {}))
+
+    assert caplog.text.count("Failed to send message to client") == 2
\ No newline at end of file
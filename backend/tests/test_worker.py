@@ -0,0 +1,56 @@
+import asyncio
+import json
+import pytest
+
+pytest.importorskip("redis")
+pytest.importorskip("arq")
+pytest.importorskip("pydantic_settings")
+
+import worker
+from core.storage import StorageManager
+
+class FakeRedis:
+    """Async Redis double recording published messages and set removals."""
+    def __init__(self) -> None:
+        self.published: list[tuple[str, dict]] = []
+        self.removed: list[tuple[str, str]] = []
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, json.loads(message)))
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        pass
+
+    async def srem(self, key: str, member: str) -> None:
+        self.removed.append((key, member))
+
+class FakeSyncRedis:
+    def exists(self, key: str) -> int:
+        return 0
+
+def test_render_reports_missing_source_without_rendering(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker, "storage_manager", StorageManager(upload_dir=str(tmp_path / "uploads"), temp_dir=str(tmp_path / ".temp")))
+    monkeypatch.setattr(worker, "get_sync_redis", lambda: FakeSyncRedis())
+
+    async def _unexpected_render(*args, **kwargs):
+        raise AssertionError("render pipeline must not run when the source is missing")
+
+    monkeypatch.setattr(worker, "render_blur_pipeline", _unexpected_render)
+    redis_conn = FakeRedis()
+    config = {
+        "filename": "missing.mp4",
+        "client_id": "client",
+        "blur_settings": {},
+        "subtitles": [],
+    }
+
+    asyncio.run(worker.render_blur_task({"redis": redis_conn, "job_id": "job-1"}, config))
+
+    finish = [msg for _, msg in redis_conn.published if msg["type"] == "finish"]
+    assert finish == [{
+        "type": "finish",
+        "success": False,
+        "error": "Source video file is no longer available. It may have been deleted.",
+        "job_id": "job-1",
+    }]
+    assert redis_conn.removed == [("pending_jobs:missing.mp4", "job-1")]
\ No newline at end of file
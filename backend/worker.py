@@ -8,6 +8,7 @@ from typing import Dict, Any
 import redis.asyncio as aioredis
 import redis
 from arq.connections import RedisSettings
+import cv2
 import numpy as np
 
 from core.config import settings
@@ -111,6 +112,9 @@ class TaskReporter:
         self._bus.publish_sync({"type": "progress", "current": t, "total": t, "eta": "00:00"})
 
 class StorageAdapter:
+    async def exists(self, key: str) -> bool:
+        return await storage_manager.file_exists(key)
+
     async def download(self, key: str, dest: str) -> bool:
         return await storage_manager.download_file(key, dest)
 
@@ -177,15 +181,13 @@ async def render_blur_task(ctx: Dict[str, Any], config: Dict[str, Any]) -> None:
     bus = RedisEventBus(redis_conn, client_id, job_id, loop)
     cancellation = RedisCancellationToken(job_id)
     reporter = TaskReporter(bus, cancellation)
-    storage = StorageAdapter()
+    storage: Storage = StorageAdapter()
 
     task_config = RenderTaskConfig(**config)
     safe_filename = os.path.basename(task_config.filename)
 
     try:
-        local_video_path = os.path.join(tempfile.gettempdir(), safe_filename)
-        dl_ok = await storage.download(safe_filename, local_video_path)
-        if not dl_ok:
+        if not await storage.exists(safe_filename):
             reporter.log("Error: source video missing")
             await bus.publish_async({
                 "type": "finish",
@@ -209,6 +211,9 @@ async def render_blur_task(ctx: Dict[str, Any], config: Dict[str, Any]) -> None:
 
 async def startup(ctx: Dict[str, Any]) -> None:
     logging.info("Worker starting up...")
+    cv2_threads = settings.opencv_threads or max(1, (os.cpu_count() or 2) // 2)
+    cv2.setNumThreads(cv2_threads)
+    logging.info(f"OpenCV thread pool limited to {cv2_threads} threads.")
     logging.info("Pre-warming OCR engine...")
     try:
         engine = get_paddle_engine(lang="en", use_gpu=True)
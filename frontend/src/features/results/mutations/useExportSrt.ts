@@ -3,12 +3,16 @@ import { useProcessingStore } from '../../../store/processingStore';
 import { useVideoStore } from '../../../store/videoStore';
 import { useUIStore } from '../../../store/uiStore';
 
+const pad = (value: number, width: number) => String(value).padStart(width, '0');
+
 const formatSrtTime = (seconds: number) => {
-  const date = new Date(0);
-  date.setSeconds(seconds);
-  date.setMilliseconds((seconds % 1) * 1000);
-  const iso = date.toISOString().substr(11, 12);
-  return iso.replace('.', ',');
+  const totalMs = Math.max(0, Math.round(seconds * 1000));
+  const ms = totalMs % 1000;
+  const totalSeconds = (totalMs - ms) / 1000;
+  const s = totalSeconds % 60;
+  const m = Math.floor(totalSeconds / 60) % 60;
+  const h = Math.floor(totalSeconds / 3600);
+  return `${pad(h, 2)}:${pad(m, 2)}:${pad(s, 2)},${pad(ms, 3)}`;
 };
 
 /**
@@ -24,12 +28,9 @@ export function useExportSrt() {
       addToast('No subtitles to export', 'error');
       return;
     }
-    let srt = '';
-    subtitles.forEach((sub, i) => {
-      srt += `${i + 1}\n`;
-      srt += `${formatSrtTime(sub.start)} --> ${formatSrtTime(sub.end)}\n`;
-      srt += `${sub.text}\n\n`;
-    });
+    const srt = subtitles
+      .map((sub, i) => `${i + 1}\n${formatSrtTime(sub.start)} --> ${formatSrtTime(sub.end)}\n${sub.text}\n\n`)
+      .join('');
     const blob = new Blob(['\uFEFF', srt], { type: 'text/plain;charset=utf-8' });
     const url = URL.createObjectURL(blob);
     const a = document.createElement('a');